@@ -2,58 +2,174 @@
 
 from __future__ import annotations
 
-import os
-from contextlib import suppress
+import heapq
 
 import homeassistant.helpers.config_validation as cv
-from g4s import Alarm
-from homeassistant.components.alarm_control_panel import (
-    DOMAIN as ALARM_CONTROL_PANEL_DOMAIN,
-)
-from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
-from homeassistant.components.camera import DOMAIN as CAMERA_DOMAIN
-from homeassistant.components.lock import DOMAIN as LOCK_DOMAIN
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.storage import STORAGE_DIR
-
-from .const import DOMAIN
+from homeassistant.const import Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    OPTIONS,
+    SERVICE_GET_HISTORY,
+    STORAGE_VERSION,
+)
 from .coordinator import G4sDataUpdateCoordinator
+from .history import G4sHistory
+from .session import async_import_library
 
-PLATFORMS = [
-    ALARM_CONTROL_PANEL_DOMAIN,
-    BINARY_SENSOR_DOMAIN,
-    # CAMERA_DOMAIN,
-    # LOCK_DOMAIN,
-    SENSOR_DOMAIN,
-    # SWITCH_DOMAIN,
-]
+# Snapshot categories with entities on the binary_sensor platform
+BINARY_SENSOR_CATEGORIES = ("door_window", "tamper", "smoke", "siren", "motion")
 
 CONFIG_SCHEMA = cv.deprecated(DOMAIN)
 
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the G4S services."""
+    # pylint: disable=unused-argument
+
+    @callback
+    def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the recorded events of one or all installations."""
+        coordinators: dict[str, G4sDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+        if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+            if entry_id not in coordinators:
+                raise ServiceValidationError(f"No loaded G4S entry {entry_id}")
+            coordinators = {entry_id: coordinators[entry_id]}
+        start = call.data.get("start")
+        end = call.data.get("end")
+        start = None if start is None else dt_util.as_timestamp(start)
+        end = None if end is None else dt_util.as_timestamp(end)
+
+        events = heapq.merge(
+            *(
+                [(event, entry_id) for event in coordinator.history.between(start, end)]
+                for entry_id, coordinator in coordinators.items()
+            ),
+            key=lambda item: item[0].time,
+        )
+        return {
+            "events": [
+                {
+                    **event.as_dict(),
+                    "time": dt_util.utc_from_timestamp(event.time).isoformat(),
+                    ATTR_CONFIG_ENTRY_ID: entry_id,
+                }
+                for event, entry_id in events
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
+
+
+@callback
+def _async_needed_platforms(coordinator: G4sDataUpdateCoordinator) -> set[Platform]:
+    """Return the platforms with entities for the devices in the snapshot."""
+    # The sensor platform also holds the diagnostic sensors of the alarm
+    platforms = {Platform.ALARM_CONTROL_PANEL, Platform.SENSOR}
+    if any(
+        getattr(coordinator.snapshot, category) for category in BINARY_SENSOR_CATEGORIES
+    ):
+        platforms.add(Platform.BINARY_SENSOR)
+    return platforms
+
+
+@callback
+def _async_migrate_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Move options saved in the entry data by older versions to the options."""
+    if moved := {key: entry.data[key] for key in OPTIONS if key in entry.data}:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={key: value for key, value in entry.data.items() if key not in moved},
+            options={**moved, **entry.options},
+        )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Retune the coordinator when the options change, without a reload."""
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_options()
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up G4S from a config entry."""
+    await async_import_library(hass)
+    _async_migrate_options(hass, entry)
     coordinator = G4sDataUpdateCoordinator(hass, entry=entry)
-
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.history.async_load()
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Start from the stored snapshot when there is one, so a slow or unreachable
+    # G4S cloud does not hold up the setup
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Set up all platforms for this device/entry.
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # The device entities refer to the hub, which must exist before they are added
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, **coordinator.hub_device_info
+    )
+
+    # Set up the platforms that have devices, and the others once devices show up
+    coordinator.platforms = _async_needed_platforms(coordinator)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    @callback
+    def _async_add_platforms() -> None:
+        if platforms := _async_needed_platforms(coordinator) - coordinator.platforms:
+            coordinator.platforms |= platforms
+            entry.async_create_background_task(
+                hass,
+                hass.config_entries.async_forward_entry_setups(entry, platforms),
+                f"{DOMAIN} platform setup",
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_platforms))
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload G4S config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
+    )
     if not unload_ok:
         return False
 
@@ -63,3 +179,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         del hass.data[DOMAIN]
 
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and history of a G4S config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await G4sHistory(hass, entry.entry_id).async_remove()
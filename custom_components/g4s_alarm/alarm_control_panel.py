@@ -7,17 +7,25 @@ from typing import Dict
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntity,
     AlarmControlPanelEntityFeature,
+    AlarmControlPanelState,
     CodeFormat,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_BATTERY_LEVEL
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ALARM_STATE_TO_HA, CONF_GIID, DOMAIN, LOGGER
+from .const import (
+    ALARM_STATE_TO_HA,
+    ATTR_STALE,
+    ATTR_UPDATE_INTERVAL,
+    CONF_GIID,
+    DOMAIN,
+    LOGGER,
+)
 from .coordinator import G4sDataUpdateCoordinator
+from .models import ALARM_CONTEXT
 
 
 async def async_setup_entry(
@@ -31,54 +39,58 @@ async def async_setup_entry(
 
 class G4sAlarm(CoordinatorEntity, AlarmControlPanelEntity):
 
+    _attr_code_format = CodeFormat.NUMBER
+    _attr_name = "G4S Alarm"
+
     def __init__(self, coordinator):
         """Representation of a G4S alarm status."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=ALARM_CONTEXT)
         self.coordinator: G4sDataUpdateCoordinator = coordinator
         self._attr_changed_by = None
-        self._attr_code_format = CodeFormat.NUMBER
-        self._attr_name = "G4S Alarm"
+        self._attr_unique_id = coordinator.entry.data[CONF_GIID]
+        self._attr_device_info = coordinator.hub_device_info
         self._attr_supported_features = (
             AlarmControlPanelEntityFeature.ARM_NIGHT
             | AlarmControlPanelEntityFeature.ARM_AWAY
         )
         self._attr_code_arm_required: bool = False
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this entity."""
-        return {
-            "name": "G4S Alarm",
-            "manufacturer": "G4S",
-            "model": "Alarm",
-            "identifiers": {(DOMAIN, self.coordinator.entry.data[CONF_GIID])},
-        }
-
-    @property
-    def unique_id(self) -> str:
-        """Return the unique ID for this entity."""
-        return self.coordinator.entry.data[CONF_GIID]
+        self._optimistic_state: AlarmControlPanelState | None = None
 
     async def _async_set_arm_state(self, state: str, code: str | None = None) -> None:
-        """Send set arm state command."""
+        """Send set arm state command.
+
+        The entity shows arming or disarming right away and returns to the state
+        reported by G4S once the command is confirmed or has failed.
+        """
         if state == "ARMED_NIGHT":
-            arm_state = await self.hass.async_add_executor_job(
-                self.coordinator.alarm.night_arm
-            )
-            LOGGER.debug("arm_state %s", arm_state)
+            command = self.coordinator.async_night_arm
         elif state == "ARMED_AWAY":
-            arm_state = await self.hass.async_add_executor_job(
-                self.coordinator.alarm.arm
-            )
-            LOGGER.debug("arm_state %s", arm_state)
-        elif state == "DISARMED":
-            if self.coordinator.validate_code(code):
-                arm_state = await self.hass.async_add_executor_job(
-                    self.coordinator.alarm.disarm
-                )
-                LOGGER.debug("arm_state %s", arm_state)
+            command = self.coordinator.async_arm
+        else:
+            try:
+                valid = await self.coordinator.async_validate_code(code)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                raise HomeAssistantError(f"Could not check the code: {ex}") from ex
+            if not valid:
+                raise ServiceValidationError("Invalid code for the G4S alarm")
+            command = self.coordinator.async_disarm
         LOGGER.debug("G4S set arm state %s", state)
-        await self.coordinator.async_refresh()
+
+        self._optimistic_state = (
+            AlarmControlPanelState.DISARMING
+            if state == "DISARMED"
+            else AlarmControlPanelState.ARMING
+        )
+        self.async_write_ha_state()
+        try:
+            confirmed = await command()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            raise HomeAssistantError(f"Could not set G4S alarm state: {ex}") from ex
+        finally:
+            self._optimistic_state = None
+            self.async_write_ha_state()
+        if not confirmed:
+            raise HomeAssistantError(f"G4S did not confirm alarm state {state}")
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
@@ -94,14 +106,16 @@ class G4sAlarm(CoordinatorEntity, AlarmControlPanelEntity):
 
     @property
     def alarm_state(self):
-        return ALARM_STATE_TO_HA.get(self.coordinator.alarm.state.name)
+        if self._optimistic_state is not None:
+            return self._optimistic_state
+        return ALARM_STATE_TO_HA.get(self.coordinator.data.alarm)
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        try:
-            self._attr_changed_by = self.coordinator.alarm.last_state_change_by.name
-        except AttributeError:
+        if self.coordinator.data.changed_by is None:
             LOGGER.info("Could not find user for last change")
+        else:
+            self._attr_changed_by = self.coordinator.data.changed_by
         super()._handle_coordinator_update()
 
     async def async_added_to_hass(self) -> None:
@@ -112,9 +126,11 @@ class G4sAlarm(CoordinatorEntity, AlarmControlPanelEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, int]:
         """Return the state of the entity."""
-        battery_level = None
-        for _, panel in self.coordinator.data["panel"].items():
-            battery_level = panel.battery_level
-        if not battery_level:
-            return {}
-        return {ATTR_BATTERY_LEVEL: battery_level}
+        attributes = {}
+        if self.coordinator.stale:
+            attributes[ATTR_STALE] = True
+        if self.coordinator.adaptive_polling:
+            attributes[ATTR_UPDATE_INTERVAL] = int(
+                self.coordinator.update_interval.total_seconds()
+            )
+        return attributes
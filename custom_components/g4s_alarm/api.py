@@ -0,0 +1,182 @@
+"""Asyncio client for the G4S cloud API."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientSession, ClientTimeout
+
+if TYPE_CHECKING:
+    from g4s import Alarm
+
+BASE_URL = "https://mit.g4severhome.dk/ESI.API/API"
+STATUS_PATH = "systemstatus/getState"
+COMMAND_PATH = "Commands/invokeAPI"
+EVENTS_PATH = "Events/InvokeApi"
+
+REQUEST_TIMEOUT = ClientTimeout(total=30)
+
+# HTTP statuses of rejected credentials
+AUTH_FAILURE_STATUSES = (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN)
+# State request Responses of rejected credentials. Other non-zero Responses are
+# treated as transient cloud failures.
+AUTH_FAILURE_RESPONSES = frozenset({1})
+
+# Same event filter the g4s library sends when looking up who changed the state
+EVENT_TYPES = (
+    "314,56,57,51,58,59,1,2,5,153,155,3,156,8,9,1010,39,40,203,211,212,215,216,222,"
+    "223,411,412,506,510,511,513,514,515,516,904,906,907,909,910,912,913,915,916,918,"
+    "919,921,104,106,105,101,103,102,150,152,151,204,1201,1207,1253,706,705,220,221,"
+    "107,109,112,113,114,418,1258,1259,1260,1875,1876,1205,1208,1602,1601,1604,1610,"
+    "1611,1640,1641,1612,1613,1614,1615,1616,927,928,930,931,933,901,903,108,810,811,"
+    "812,813,814,927,815,1617,1618,1810,1811,1891,1892,1893,1894,1895,1896,30,1812,"
+    "1879,1883,1884,1899,1900,1901,1902,1903"
+)
+
+
+class G4sApiError(Exception):
+    """Error reported by the G4S cloud."""
+
+
+class G4sAuthError(G4sApiError):
+    """The G4S cloud rejected the credentials."""
+
+
+def library_error(ex: Exception) -> G4sApiError | None:
+    """Return the API error matching an error of the g4s library, if it is one.
+
+    The library raises ``requests.HTTPError`` for HTTP errors and a bare
+    ``Exception`` for a non-zero ``Response``. The latter only carries the
+    description, so it cannot be told apart from an outage and is transient.
+    """
+    status = getattr(getattr(ex, "response", None), "status_code", None)
+    if status in AUTH_FAILURE_STATUSES:
+        return G4sAuthError(f"G4S rejected the credentials ({status})")
+    if type(ex) is Exception:  # pylint: disable=unidiomatic-typecheck
+        return G4sApiError(str(ex))
+    return None
+
+
+class G4sApiClient:
+    """Talk to the G4S cloud through Home Assistant's shared aiohttp session.
+
+    The results are written back onto a regular ``g4s.Alarm`` so the rest of the
+    integration does not care which client fetched the data.
+    """
+
+    def __init__(self, session: ClientSession, alarm: Alarm) -> None:
+        """Initialize the client."""
+        self._session = session
+        self.alarm = alarm
+        self.state_bytes: int | None = None
+
+    async def _async_request(self, path: str, body: dict[str, Any]) -> bytes:
+        async with self._session.post(
+            f"{BASE_URL}/{path}", json=body, timeout=REQUEST_TIMEOUT
+        ) as response:
+            if response.status in AUTH_FAILURE_STATUSES:
+                raise G4sAuthError(f"G4S rejected the credentials ({response.status})")
+            response.raise_for_status()
+            return await response.read()
+
+    async def _async_post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        return json.loads(await self._async_request(path, body))
+
+    async def async_get_state(self) -> dict[str, Any]:
+        """Fetch the raw system state."""
+        api = self.alarm.api
+        body: dict[str, Any] = {"username": api.username, "password": api.password}
+        if api.panel_id is not None:
+            body["panel_id"] = api.panel_id
+        payload = await self._async_request(STATUS_PATH, body)
+        self.state_bytes = len(payload)
+        data = json.loads(payload)
+        if data["Response"] in AUTH_FAILURE_RESPONSES:
+            # G4S answers a wrong password with HTTP 200 and a non-zero Response
+            raise G4sAuthError(data["ResponseDescription"])
+        if data["Response"] != 0:
+            raise G4sApiError(data["ResponseDescription"])
+        if api.panel_id is None:
+            api.panel_id = data["panelInfo"]["PanelId"]
+        return data
+
+    async def async_get_events(self, date: datetime | None) -> list[dict[str, Any]]:
+        """Fetch the event history for the day of ``date``."""
+        api = self.alarm.api
+        body: dict[str, Any] = {
+            "email": api.username,
+            "password": api.password,
+            "methodToInvoke": "GetEventsHistory",
+            "panelId": api.panel_id,
+            "eventTypeList": EVENT_TYPES,
+            "numberOfEvents": 100,
+        }
+        if date is not None:
+            body["fromDate"] = date.strftime("%Y-%m-%d")
+            body["toDate"] = (date + timedelta(days=1)).strftime("%Y-%m-%d")
+        return json.loads((await self._async_post(EVENTS_PATH, body))["Events"])
+
+    async def async_update_status(self) -> None:
+        """Refresh the alarm, mirroring ``Alarm.update_status``."""
+        # pylint: disable-next=import-outside-toplevel
+        from g4s.utils.alarm_status import AlarmStatus
+
+        alarm = self.alarm
+        alarm.status = AlarmStatus(await self.async_get_state(), alarm.api)
+        alarm.panel_settings = alarm.status.panel_settings
+        alarm.users = alarm.status.users
+        alarm.state = alarm.status.system_state.arm_type
+        alarm.sensors = alarm.status.state_devices
+        alarm.last_state_change = alarm.status.system_state.arm_type_changed_time
+
+        # Do not keep the user of an earlier change if no event names one
+        alarm.last_state_change_by = None
+        time_zone = alarm.panel_settings.time_zone
+        for event in await self.async_get_events(alarm.last_state_change):
+            event = event["Events"][0]
+            local_time = event["Header"]["LocalTime"].replace('"', "")
+            if (
+                event["UserId"] is not None
+                and time_zone.date_time_as_utc(local_time) == alarm.last_state_change
+            ):
+                for user in alarm.users:
+                    if user.id == event["UserId"]:
+                        alarm.last_state_change_by = user
+                break
+
+        alarm.panel_settings.default_temperature_device = next(
+            (
+                sensor
+                for sensor in alarm.sensors
+                if sensor.id == alarm.panel_settings.default_temperature_device_id
+            ),
+            None,
+        )
+
+    async def _async_command(self, method: str, partition: int | None = None) -> None:
+        """Send a command without refreshing the status, unlike ``g4s.Alarm``."""
+        api = self.alarm.api
+        body: dict[str, Any] = {
+            "email": api.username,
+            "password": api.password,
+            "methodToInvoke": method,
+            "panelId": api.panel_id,
+        }
+        if partition is not None:
+            body["partition"] = partition
+        await self._async_post(COMMAND_PATH, body)
+
+    async def async_arm(self) -> None:
+        """Arm the alarm."""
+        await self._async_command("Arm", 0)
+
+    async def async_night_arm(self) -> None:
+        """Night arm the alarm."""
+        await self._async_command("Arm", 2)
+
+    async def async_disarm(self) -> None:
+        """Disarm the alarm."""
+        await self._async_command("Disarm")
@@ -2,21 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from functools import partial
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_BATTERY_LEVEL
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_GIID, DOMAIN
 from .coordinator import G4sDataUpdateCoordinator
+from .entity import (
+    DeviceEntityFactory,
+    G4sDeviceEntity,
+    async_setup_device_entities,
+)
 
 
 async def async_setup_entry(
@@ -25,64 +27,82 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up G4S binary sensors based on a config entry."""
-    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    sensors = [
-        G4sDoorWindowSensor(coordinator, serial_number)
-        for serial_number in coordinator.data["door_window"]
-    ]
-
-    async_add_entities(sensors)
+    async_setup_device_entities(hass, entry, async_add_entities, DEVICE_SENSORS)
 
 
-class G4sDoorWindowSensor(CoordinatorEntity, BinarySensorEntity):
+class G4sDoorWindowSensor(G4sDeviceEntity, BinarySensorEntity):
     """Representation of a G4S door window sensor."""
 
-    coordinator: G4sDataUpdateCoordinator
-
     _attr_device_class = BinarySensorDeviceClass.OPENING
 
     def __init__(
         self, coordinator: G4sDataUpdateCoordinator, serial_number: str
     ) -> None:
         """Initialize the G4S door window sensor."""
-        super().__init__(coordinator)
-        self._attr_name = coordinator.data["door_window"][serial_number].name
+        super().__init__(coordinator, "door_window", serial_number)
         self._attr_unique_id = f"{serial_number}_door_window"
-        self.serial_number = serial_number
 
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this entity."""
-        area = self.coordinator.data["door_window"][self.serial_number].name
-        return {
-            "name": area,
-            "suggested_area": area,
-            "manufacturer": "G4S",
-            "model": "Door Window Sensor",
-            "identifiers": {(DOMAIN, self.serial_number)},
-            "via_device": (DOMAIN, self.coordinator.entry.data[CONF_GIID]),
-        }
+    def is_on(self) -> bool:
+        """Return the state of the sensor."""
+        return self._device.is_open
+
+
+class G4sTamperSensor(G4sDeviceEntity, BinarySensorEntity):
+    """Tamper state of a G4S device."""
+
+    _attr_device_class = BinarySensorDeviceClass.TAMPER
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _suffix = "Tamper"
+
+    def __init__(
+        self, coordinator: G4sDataUpdateCoordinator, serial_number: str
+    ) -> None:
+        """Initialize the G4S tamper sensor."""
+        super().__init__(coordinator, "tamper", serial_number)
+        self._attr_unique_id = f"{serial_number}_tamper"
 
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
-        return self.coordinator.data["door_window"][self.serial_number].is_open
+        return self._device.is_tampered
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return (
-            super().available
-            and self.serial_number in self.coordinator.data["door_window"]
-        )
+
+class G4sTriggerSensor(G4sDeviceEntity, BinarySensorEntity):
+    """Whether a G4S smoke detector, siren or motion detector is triggered."""
+
+    def __init__(
+        self,
+        coordinator: G4sDataUpdateCoordinator,
+        serial_number: str,
+        category: str,
+    ) -> None:
+        """Initialize the G4S trigger sensor."""
+        # Set before the base class names the entity
+        self._suffix, self._attr_device_class = TRIGGER_SENSORS[category]
+        super().__init__(coordinator, category, serial_number)
+        self._attr_unique_id = f"{serial_number}_{category}"
 
     @property
-    def extra_state_attributes(self) -> Dict[str, int]:
-        """Return the state of the entity."""
-        battery_level = self.coordinator.data["climate"][
-            self.serial_number
-        ].battery_level
-        if not battery_level:
-            return {}
-        return {ATTR_BATTERY_LEVEL: battery_level}
+    def is_on(self) -> bool:
+        """Return the state of the sensor."""
+        return self._device.is_triggered
+
+
+# Name suffix and device class of the trigger sensor of each category. The
+# sensors show whether the device triggered the alarm, not a sound or motion.
+TRIGGER_SENSORS: dict[str, tuple[str, BinarySensorDeviceClass]] = {
+    "smoke": ("Smoke", BinarySensorDeviceClass.SMOKE),
+    "siren": ("Siren", BinarySensorDeviceClass.SAFETY),
+    "motion": ("Motion", BinarySensorDeviceClass.SAFETY),
+}
+
+# Binary sensor entity of each snapshot category with device sensors
+DEVICE_SENSORS: dict[str, DeviceEntityFactory] = {
+    "door_window": G4sDoorWindowSensor,
+    "tamper": G4sTamperSensor,
+    **{
+        category: partial(G4sTriggerSensor, category=category)
+        for category in TRIGGER_SENSORS
+    },
+}
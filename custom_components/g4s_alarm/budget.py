@@ -0,0 +1,109 @@
+"""Request budgets shared by the G4S config entries of an account."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    BUDGET_CAPACITY,
+    BUDGET_COMMAND_RESERVE,
+    BUDGET_REFILL_INTERVAL,
+    DATA_BUDGET,
+)
+
+
+class G4sRequestBudget:
+    """Token bucket limiting the requests made for a G4S account.
+
+    The bucket holds ``BUDGET_CAPACITY`` requests and earns one every
+    ``BUDGET_REFILL_INTERVAL``, however many installations the account has.
+    Commands are served before polls, and polls leave
+    ``BUDGET_COMMAND_RESERVE`` requests for commands. Requests of the same
+    priority are served in order, so a busy config entry cannot starve the
+    others.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a full bucket."""
+        self.hass = hass
+        self.capacity = BUDGET_CAPACITY
+        self._tokens = float(self.capacity)
+        self._time = time.monotonic()
+        # (priority, sequence, cost, future), lowest priority value first
+        self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wake_handle: asyncio.TimerHandle | None = None
+        self.throttled = 0
+
+    @property
+    def _rate(self) -> float:
+        return 1 / BUDGET_REFILL_INTERVAL.total_seconds()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._time) * self._rate
+        )
+        self._time = now
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests that can be made right away."""
+        self._refill()
+        return int(self._tokens)
+
+    @staticmethod
+    def _needed(priority: int, cost: int) -> int:
+        return cost if priority == 0 else cost + BUDGET_COMMAND_RESERVE
+
+    async def async_acquire(self, cost: int = 1, command: bool = False) -> None:
+        """Wait until ``cost`` requests may be made."""
+        priority = 0 if command else 1
+        self._refill()
+        if not self._waiters and self._tokens >= self._needed(priority, cost):
+            self._tokens -= cost
+            return
+        self.throttled += 1
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), cost, future))
+        self._async_wake()
+        await future
+
+    @callback
+    def _async_wake(self) -> None:
+        """Let the waiters through that fit in the bucket, in priority order."""
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        self._refill()
+        while self._waiters:
+            priority, _, cost, future = self._waiters[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            needed = self._needed(priority, cost)
+            if self._tokens < needed:
+                self._wake_handle = self.hass.loop.call_later(
+                    (needed - self._tokens) / self._rate, self._async_wake
+                )
+                return
+            heapq.heappop(self._waiters)
+            self._tokens -= cost
+            future.set_result(None)
+
+
+@callback
+def async_get_budget(hass: HomeAssistant, email: str) -> G4sRequestBudget:
+    """Return the request budget of the G4S account ``email``."""
+    budgets: dict[str, G4sRequestBudget] = hass.data.setdefault(DATA_BUDGET, {})
+    if (budget := budgets.get(email)) is None:
+        budget = budgets[email] = G4sRequestBudget(hass)
+    return budget
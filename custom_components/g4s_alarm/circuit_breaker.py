@@ -0,0 +1,63 @@
+"""Circuit breaker for calls to the G4S cloud."""
+
+from __future__ import annotations
+
+import random
+import time
+from enum import Enum
+
+from .const import BACKOFF_BASE, BACKOFF_MAX, CIRCUIT_FAILURE_THRESHOLD
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the G4S cloud while the circuit is open."""
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class G4sCircuitBreaker:
+    """Stop calling the G4S cloud for a while after repeated failures.
+
+    After ``CIRCUIT_FAILURE_THRESHOLD`` failures in a row the circuit opens for
+    an exponentially growing, jittered delay. Once the delay has passed one
+    call is let through, which closes the circuit on success and opens it again
+    on failure.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def allow(self) -> bool:
+        """Return True if the cloud may be called."""
+        if self.state is CircuitState.OPEN and time.monotonic() >= self.retry_at:
+            self.state = CircuitState.HALF_OPEN
+        return self.state is not CircuitState.OPEN
+
+    def success(self) -> None:
+        """Record a successful call."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def failure(self) -> bool:
+        """Record a failed call, returning True if the circuit opened."""
+        self.failures += 1
+        if (
+            self.state is CircuitState.CLOSED
+            and self.failures < CIRCUIT_FAILURE_THRESHOLD
+        ):
+            return False
+        exponent = min(max(self.failures - CIRCUIT_FAILURE_THRESHOLD, 0), 16)
+        delay = min(
+            BACKOFF_BASE.total_seconds() * 2**exponent, BACKOFF_MAX.total_seconds()
+        )
+        # Jitter the delay so config entries do not retry in lockstep
+        self.retry_at = time.monotonic() + random.uniform(delay / 2, delay)
+        self.state = CircuitState.OPEN
+        return True
@@ -6,13 +6,28 @@ from datetime import timedelta
 from typing import Any
 
 import voluptuous as vol
-from g4s import Alarm
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import CONF_GIID, DEFAULT_SCAN_INTERVAL, DOMAIN, LOGGER
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_BACKOFF_FACTOR,
+    CONF_CLIMATE_DEADBAND,
+    CONF_GIID,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_CLIMATE_DEADBAND,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    MIN_ALLOWED_SCAN_INTERVAL,
+)
+from .session import async_get_session, async_import_library
 
 
 class G4SOptionsFlowHandler(OptionsFlow):
@@ -24,30 +39,66 @@ class G4SOptionsFlowHandler(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            for k, v in self.entry.data.items():
-                if k not in user_input.keys():
-                    user_input[k] = v
-            self.hass.config_entries.async_update_entry(
-                self.entry, data=user_input, options=self.entry.options
-            )
-            self.async_abort(reason="configuration updated")
-            return self.async_create_entry(title="", data={})
+            if user_input.get(
+                CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL.total_seconds()
+            ) > user_input.get(
+                CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL.total_seconds()
+            ):
+                errors["base"] = "invalid_scan_interval_bounds"
+            else:
+                # Applied to the running coordinator by the update listener
+                return self.async_create_entry(title="", data=user_input)
 
         default_scan_interval = DEFAULT_SCAN_INTERVAL
-        if self.entry.data.get(CONF_SCAN_INTERVAL) is not None:
+        if self.entry.options.get(CONF_SCAN_INTERVAL) is not None:
             default_scan_interval = timedelta(
-                seconds=int(self.entry.data.get(CONF_SCAN_INTERVAL))
+                seconds=int(self.entry.options.get(CONF_SCAN_INTERVAL))
             )
+        # Faster polling gets the G4S API to throttle all entries
+        min_interval = int(MIN_ALLOWED_SCAN_INTERVAL.total_seconds())
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Optional(
                         CONF_SCAN_INTERVAL, default=default_scan_interval.total_seconds
-                    ): int
+                    ): vol.All(vol.Coerce(int), vol.Range(min=min_interval)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.entry.options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=self.entry.options.get(
+                            CONF_MIN_SCAN_INTERVAL,
+                            int(DEFAULT_MIN_SCAN_INTERVAL.total_seconds()),
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=min_interval)),
+                    vol.Optional(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=self.entry.options.get(
+                            CONF_MAX_SCAN_INTERVAL,
+                            int(DEFAULT_MAX_SCAN_INTERVAL.total_seconds()),
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=min_interval)),
+                    vol.Optional(
+                        CONF_BACKOFF_FACTOR,
+                        default=self.entry.options.get(
+                            CONF_BACKOFF_FACTOR, DEFAULT_BACKOFF_FACTOR
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_CLIMATE_DEADBAND,
+                        default=self.entry.options.get(
+                            CONF_CLIMATE_DEADBAND, DEFAULT_CLIMATE_DEADBAND
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
                 }
             ),
+            errors=errors,
         )
 
 
@@ -68,18 +119,20 @@ class G4SConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            alarm = Alarm(
-                username=user_input[CONF_EMAIL], password=user_input[CONF_PASSWORD]
+            await async_import_library(self.hass)
+            session = async_get_session(
+                self.hass, user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
             )
             try:
-                await self.hass.async_add_executor_job(alarm.update_status)
+                await session.async_login()
             except Exception as ex:  # pylint: disable=broad-exception-caught
                 LOGGER.debug("Could not log in to G4S, %s", ex)
                 errors["base"] = "invalid_auth"
             else:
                 self.email = user_input[CONF_EMAIL]
                 self.password = user_input[CONF_PASSWORD]
-                self.installations = {str(alarm.status.panel_id): alarm.status.name}
+                status = session.alarm.status
+                self.installations = {str(status.panel_id): status.name}
                 return await self.async_step_installation()
 
         return self.async_show_form(
@@ -132,11 +185,12 @@ class G4SConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            alarm = Alarm(
-                username=user_input[CONF_EMAIL], password=user_input[CONF_PASSWORD]
+            await async_import_library(self.hass)
+            session = async_get_session(
+                self.hass, user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
             )
             try:
-                await self.hass.async_add_executor_job(alarm.update_status)
+                await session.async_login()
             except Exception as ex:  # pylint: disable=broad-exception-caught
                 LOGGER.debug("Could not log in to G4S, %s", ex)
                 errors["base"] = "invalid_auth"
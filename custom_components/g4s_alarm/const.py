@@ -4,18 +4,115 @@ import logging
 from datetime import timedelta
 
 from homeassistant.components.alarm_control_panel import AlarmControlPanelState
+from homeassistant.const import CONF_SCAN_INTERVAL
 
 DOMAIN = "g4s_alarm"
 
 LOGGER = logging.getLogger(__package__)
 
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+DATA_BUDGET = f"{DOMAIN}_budget"
+DATA_LOOP_PROBE = f"{DOMAIN}_loop_probe"
+
 CONF_GIID = "giid"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_BACKOFF_FACTOR = "backoff_factor"
+CONF_CLIMATE_DEADBAND = "climate_deadband"
+
+# Keys of the options flow, kept in the options of the config entry
+OPTIONS = (
+    CONF_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_BACKOFF_FACTOR,
+    CONF_CLIMATE_DEADBAND,
+)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_STALE = "stale"
+ATTR_UPDATE_INTERVAL = "update_interval"
+
+# How long a login is trusted and how long the status it fetched can be reused
+SESSION_TTL = timedelta(minutes=10)
+SESSION_STATUS_TTL = timedelta(minutes=1)
+
+# Installations of one account polled at the same time
+MAX_CONCURRENT_POLLS = 4
+
+# Requests to the G4S cloud allowed in a burst and the time to earn another,
+# for each G4S account. The config entries of an account share its budget, and
+# polls leave a few requests of it for commands.
+BUDGET_CAPACITY = 30
+BUDGET_REFILL_INTERVAL = timedelta(seconds=3)
+BUDGET_COMMAND_RESERVE = 4
+# Requests made by a status poll, the state and the event history
+POLL_REQUESTS = 2
+
+# How often the loop probe measures the event loop lag and the executor wait
+LOOP_PROBE_INTERVAL = timedelta(seconds=1)
+
+STORAGE_VERSION = 3
+# Delay before the latest snapshot is written to storage
+SNAPSHOT_SAVE_DELAY = timedelta(minutes=1)
+
+# Event history
+HISTORY_SIZE = 500
+EVENT_G4S_ALARM = f"{DOMAIN}_event"
+SERVICE_GET_HISTORY = "get_history"
+
+# Polls in a row a device must be missing from before it is removed
+DEVICE_REMOVAL_POLLS = 3
+
+# Dispatched with the (category, key) of devices added to or removed from the
+# snapshot of a config entry, formatted with the entry id
+SIGNAL_DEVICES_ADDED = f"{DOMAIN}_devices_added_{{}}"
+SIGNAL_DEVICES_REMOVED = f"{DOMAIN}_devices_removed_{{}}"
 
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=1)
+DEFAULT_MIN_SCAN_INTERVAL = timedelta(seconds=10)
+# Lowest scan interval accepted by the options flow
+MIN_ALLOWED_SCAN_INTERVAL = timedelta(seconds=10)
+DEFAULT_MAX_SCAN_INTERVAL = timedelta(minutes=5)
+DEFAULT_BACKOFF_FACTOR = 2.0
+# Seconds a poll may start before it is due and still count as scheduled,
+# Home Assistant rounds the timer of the coordinator
+POLL_JITTER_TOLERANCE = 1.0
+
+# Change of a climate reading needed before it is written to the state machine
+DEFAULT_CLIMATE_DEADBAND = 0.0
+
+# How long to keep polling at the minimum interval after activity
+ACTIVITY_WINDOW = timedelta(minutes=2)
+
+# Refreshes within this time of the last fetch reuse its result
+REFRESH_FRESHNESS = timedelta(seconds=5)
+
+# How long calls use the g4s library after the asyncio client failed unexpectedly
+CLIENT_RETRY_INTERVAL = timedelta(minutes=10)
+
+# Failures in a row before the circuit opens, and the backoff while it is open
+CIRCUIT_FAILURE_THRESHOLD = 3
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(minutes=30)
+
+# How long entities keep their last known state while G4S cannot be reached
+MAX_STALE_AGE = timedelta(minutes=30)
+
+# How long to poll for confirmation of an arm or disarm command, the delay
+# before the first retry and the most polls made. The delay doubles after each
+# retry, so a command takes at most 1 + COMMAND_CONFIRM_FETCHES * POLL_REQUESTS
+# requests.
+COMMAND_CONFIRM_TIMEOUT = timedelta(seconds=30)
+COMMAND_CONFIRM_INTERVAL = timedelta(seconds=2)
+COMMAND_CONFIRM_FETCHES = 5
 
 # Mapping of device types to a human readable name
 DEVICE_TYPE_NAME = {
     "CAMERAPIR2": "Camera detector",
+    "DOORWINDOWSENSOR": "Door Window Sensor",
     "HOMEPAD1": "VoiceBox",
     "HUMIDITY1": "Climate sensor",
     "PIR2": "Camera detector",
@@ -2,100 +2,697 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
+import time
+from collections.abc import Callable
 from datetime import timedelta
+from typing import Any
 
-from g4s import Alarm
-from g4s.utils.enums import DeviceType
+from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, LOGGER
+from .api import G4sApiClient, G4sApiError, G4sAuthError, library_error
+from .budget import async_get_budget
+from .circuit_breaker import CircuitOpenError, G4sCircuitBreaker
+from .const import (
+    ACTIVITY_WINDOW,
+    ATTR_CONFIG_ENTRY_ID,
+    CLIENT_RETRY_INTERVAL,
+    COMMAND_CONFIRM_FETCHES,
+    COMMAND_CONFIRM_INTERVAL,
+    COMMAND_CONFIRM_TIMEOUT,
+    CONF_ADAPTIVE_POLLING,
+    CONF_BACKOFF_FACTOR,
+    CONF_CLIMATE_DEADBAND,
+    CONF_GIID,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_CLIMATE_DEADBAND,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_TYPE_NAME,
+    DOMAIN,
+    EVENT_G4S_ALARM,
+    LOGGER,
+    MAX_STALE_AGE,
+    MIN_ALLOWED_SCAN_INTERVAL,
+    POLL_JITTER_TOLERANCE,
+    POLL_REQUESTS,
+    REFRESH_FRESHNESS,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .history import G4sEvent, G4sHistory
+from .metrics import G4sMetrics
+from .models import (
+    ALARM_CONTEXT,
+    CLIMATE_FIELDS,
+    G4sCodeIndex,
+    G4sDevice,
+    G4sSnapshot,
+)
+from .probe import async_get_loop_probe
+from .session import async_get_session
 
 
-class G4sDataUpdateCoordinator(DataUpdateCoordinator):
+class G4sSnapshotStore(Store[dict[str, Any]]):
+    """Storage of the last good snapshot of an installation."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Drop the devices of snapshots stored by older versions.
+
+        Version 1 keyed the devices by name, version 2 devices without a serial
+        number by their id alone. Neither matches the keys of the next poll,
+        the devices come back with it.
+        """
+        # pylint: disable=unused-argument
+        if old_major_version in (1, 2):
+            return {**old_data, "devices": []}
+        raise NotImplementedError
+
+
+class G4sDataUpdateCoordinator(DataUpdateCoordinator[G4sSnapshot]):
     """A G4S Data Update Coordinator."""
 
+    # pylint: disable=too-many-instance-attributes,attribute-defined-outside-init
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the G4S hub."""
         self.entry = entry
 
-        self.alarm = Alarm(
-            username=entry.data[CONF_EMAIL], password=entry.data[CONF_PASSWORD]
+        self.session = async_get_session(
+            hass, entry.data[CONF_EMAIL], entry.data[CONF_PASSWORD]
         )
+        self.client: G4sApiClient = self.session.async_get_client(entry.data[CONF_GIID])
+        self.alarm = self.client.alarm
+        # Calls use the g4s library until then, after the asyncio client failed
+        self._fallback_until = float("-inf")
+        entry.async_on_unload(self.session.async_register(entry.data[CONF_GIID], self))
 
-        update_interval = (
-            DEFAULT_SCAN_INTERVAL
-            if self.entry.data.get(CONF_SCAN_INTERVAL) is None
-            else timedelta(seconds=self.entry.data.get(CONF_SCAN_INTERVAL))
+        # Device of the alarm panel, the other devices are connected through it
+        self.hub_device_info = DeviceInfo(
+            name="G4S Alarm",
+            manufacturer="G4S",
+            model="Alarm",
+            identifiers={(DOMAIN, entry.data[CONF_GIID])},
         )
+        # Device info by device key, with the name and type it was built from
+        self._device_infos: dict[str, tuple[tuple[str, str], DeviceInfo]] = {}
+        # Climate reading last written by listener context, see the deadband
+        self.reported_climate: dict[tuple[str, str], float] = {}
+        self._active_until = 0.0
+        self._reported_interval: timedelta | None = None
+        update_interval = self._apply_options()
+
+        self.snapshot = G4sSnapshot(entry.data[CONF_GIID])
+        # Last good snapshot, used to create the entities before the first poll
+        self._store = G4sSnapshotStore(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self.history = G4sHistory(hass, entry.entry_id)
+        # Platforms forwarded for the config entry
+        self.platforms: set[Platform] = set()
+        self.stale = False
+        self.codes = G4sCodeIndex()
+        self._notify_all = False
+        self._changed_contexts: set[object] | None = None
+        self.suppressed_writes = 0
+        self._fetch_task: asyncio.Task[None] | None = None
+        self._fetch_time = float("-inf")
+        self.coalesced_fetches = 0
+        self.metrics = G4sMetrics()
+        # Monotonic time the next scheduled poll is due
+        self._poll_due: float | None = None
+        self.breaker = G4sCircuitBreaker()
+        self.budget = async_get_budget(hass, entry.data[CONF_EMAIL])
+        # The first scheduled poll is staggered, see _schedule_refresh
+        self._staggered = False
+        # Runs while its metric sensors are enabled
+        self.probe = async_get_loop_probe(hass)
+        # When the snapshot last held live or restored data
+        self._data_time = float("-inf")
 
         super().__init__(hass, LOGGER, name=DOMAIN, update_interval=update_interval)
 
-    def validate_code(self, code) -> bool:
-        valid_user_code = (
-            len([user for user in self.alarm.users if user.access_code == code]) > 0
+    def _apply_options(self) -> timedelta:
+        """Read the options of the config entry, returning the update interval."""
+        options = self.entry.options
+        update_interval = (
+            DEFAULT_SCAN_INTERVAL
+            if options.get(CONF_SCAN_INTERVAL) is None
+            # Entries may predate the lower bound of the options flow
+            else max(
+                timedelta(seconds=options[CONF_SCAN_INTERVAL]),
+                MIN_ALLOWED_SCAN_INTERVAL,
+            )
+        )
+
+        # Adaptive polling polls at the minimum interval while something is going
+        # on and backs off towards the maximum interval while the system is quiet
+        self.adaptive_polling: bool = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.min_scan_interval = max(
+            timedelta(
+                seconds=options.get(
+                    CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL.total_seconds()
+                )
+            ),
+            MIN_ALLOWED_SCAN_INTERVAL,
         )
-        valid_chip_code = (
-            len(
-                [
-                    chip.name
-                    for chip in self.alarm.sensors
-                    if chip.type == DeviceType.ACCESSCHIP
-                    and chip.access_code is not None
-                    and chip.access_code == code
-                ]
+        self.max_scan_interval = timedelta(
+            seconds=options.get(
+                CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL.total_seconds()
             )
-            > 0
         )
-        LOGGER.info("Valid user code: %s", valid_user_code)
-        LOGGER.info("Valid access chip code: %s", valid_chip_code)
-        return code is not None and (valid_user_code or valid_chip_code)
+        self.backoff_factor: float = options.get(
+            CONF_BACKOFF_FACTOR, DEFAULT_BACKOFF_FACTOR
+        )
+        self.climate_deadband: float = options.get(
+            CONF_CLIMATE_DEADBAND, DEFAULT_CLIMATE_DEADBAND
+        )
+        if self.adaptive_polling:
+            return self.min_scan_interval
+        return update_interval
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from G4S."""
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed options to the running coordinator.
+
+        The session, the snapshot and the entities are kept, only the timer of
+        the next poll is restarted.
+        """
+        self.update_interval = self._apply_options()
+        if self._listeners:
+            self._schedule_refresh()
+        if self.data is not None:
+            # The alarm panel shows the adaptive update interval
+            self._reported_interval = self.update_interval
+            self._changed_contexts = {ALARM_CONTEXT}
+            self.async_update_listeners()
+        LOGGER.debug("Applied options, next update in %s", self.update_interval)
+
+    @callback
+    def async_get_device_info(self, record: G4sDevice) -> DeviceInfo:
+        """Return the device info of a device, built again if its name or type changed.
+
+        Entities compare the returned object by identity to know when to refresh.
+        The device registry only picks up device info when an entity is added,
+        so a device that changed is updated there as well.
+        """
+        metadata = (record.name, record.device_type)
+        cached = self._device_infos.get(record.key)
+        if cached is None or cached[0] != metadata:
+            model = DEVICE_TYPE_NAME.get(record.device_type, record.device_type)
+            info = DeviceInfo(
+                name=record.name,
+                suggested_area=record.name,
+                manufacturer="G4S",
+                model=model,
+                identifiers={(DOMAIN, record.key)},
+                via_device=(DOMAIN, self.entry.data[CONF_GIID]),
+            )
+            if cached is not None:
+                device_registry = dr.async_get(self.hass)
+                if device := device_registry.async_get_device(
+                    identifiers={(DOMAIN, record.key)}
+                ):
+                    device_registry.async_update_device(
+                        device.id,
+                        name=record.name,
+                        model=model,
+                        suggested_area=record.name,
+                    )
+            cached = self._device_infos[record.key] = (metadata, info)
+        return cached[1]
+
+    async def async_validate_code(self, code: str | None) -> bool:
+        """Return True if ``code`` belongs to a user or an access chip.
+
+        A restored snapshot holds no codes, so until the first status is fetched
+        the code is checked against a fresh one.
+        """
+        if self._fetch_time == float("-inf"):
+            await self.async_fetch()
+            self.codes.update(self.alarm)
+        valid_code = self.codes.validate(code)
+        LOGGER.debug("Valid user or access chip code: %s", valid_code)
+        return valid_code
+
+    async def _async_call(
+        self,
+        method: str,
+        fallback: Callable[[], Any],
+        cost: int = 1,
+        command: bool = False,
+    ) -> None:
+        """Run a client method, preferring the asyncio client.
+
+        The call waits for ``cost`` requests of the shared request budget.
+        If the asyncio client fails in a way the cloud did not report, the call
+        and those of the next ``CLIENT_RETRY_INTERVAL`` use the blocking g4s
+        library in the executor, then the asyncio client is tried again.
+        """
+        await self.budget.async_acquire(cost, command)
+        if time.monotonic() >= self._fallback_until:
+            try:
+                await getattr(self.client, f"async_{method}")()
+                self.session.async_renew()
+                return
+            except (ClientError, TimeoutError, G4sApiError):
+                raise
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                LOGGER.warning(
+                    "Asyncio G4S client failed, using the g4s library for %s: %s",
+                    CLIENT_RETRY_INTERVAL,
+                    ex,
+                )
+                self._fallback_until = (
+                    time.monotonic() + CLIENT_RETRY_INTERVAL.total_seconds()
+                )
+        metrics = self.metrics
+        metrics.fallback_pending += 1
+        metrics.fallback_pending_max = max(
+            metrics.fallback_pending_max, metrics.fallback_pending
+        )
         try:
-            LOGGER.debug("updating data")
-            await self.hass.async_add_executor_job(self.alarm.update_status)
-            LOGGER.debug("got new data")
+            await self.hass.async_add_executor_job(fallback)
         except Exception as ex:
-            LOGGER.error("Could not update data, %s", ex)
+            if (error := library_error(ex)) is not None:
+                raise error from ex
             raise
+        finally:
+            metrics.fallback_pending -= 1
+        self.session.async_renew()
+
+    async def _async_command(
+        self, method: str, fallback: Callable[[], Any], target_states: set[str]
+    ) -> bool:
+        """Send a command and poll until the cloud reports one of the targets.
+
+        Returns whether the new state was confirmed before the timeout.
+        """
+        self.async_mark_activity()
+        await self._async_call(method, fallback, command=True)
+        # The cloud is reachable, so do not wait for the circuit to half-open
+        self.breaker.success()
+
+        deadline = time.monotonic() + COMMAND_CONFIRM_TIMEOUT.total_seconds()
+        delay = COMMAND_CONFIRM_INTERVAL.total_seconds()
+        for fetch in range(COMMAND_CONFIRM_FETCHES):
+            if fetch:
+                self.metrics.retries += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+            await self.async_fetch(max_age=0, command=True)
+            confirmed = self.alarm.state.name in target_states
+            if confirmed or time.monotonic() >= deadline:
+                break
+
+        self.async_set_updated_data(self._async_update_snapshot())
+        return confirmed
+
+    async def async_arm(self) -> bool:
+        """Arm the alarm."""
+        return await self._async_command(
+            "arm", self.alarm.api.arm_alarm, {"FULL_ARM", "PENDING_ARM"}
+        )
+
+    async def async_night_arm(self) -> bool:
+        """Night arm the alarm."""
+        return await self._async_command(
+            "night_arm", self.alarm.api.night_arm_alarm, {"NIGHT_ARM", "PENDING_ARM"}
+        )
+
+    async def async_disarm(self) -> bool:
+        """Disarm the alarm."""
+        return await self._async_command(
+            "disarm", self.alarm.api.disarm_alarm, {"DISARMED"}
+        )
+
+    @callback
+    def async_mark_activity(self) -> None:
+        """Poll at the minimum interval for a while."""
+        self._active_until = time.monotonic() + ACTIVITY_WINDOW.total_seconds()
+        if self.adaptive_polling:
+            self.update_interval = self.min_scan_interval
+
+    def _next_update_interval(self) -> timedelta:
+        """Return the adaptive interval until the next poll."""
+        if (
+            self.snapshot.alarm == "PENDING_ARM"
+            or time.monotonic() < self._active_until
+        ):
+            return self.min_scan_interval
+        return min(
+            max(self.update_interval * self.backoff_factor, self.min_scan_interval),
+            self.max_scan_interval,
+        )
 
-        # Store data in a way Home Assistant can easily consume it
-        return {
-            "alarm": self.alarm.state.name,
-            # "ethernet": overview.get("ethernetConnectedNow"),
-            # "cameras": {
-            #     device["deviceLabel"]: device
-            #     for device in overview["customerImageCameras"]
-            # },
-            "climate": {
-                device.name: device
-                for device in self.alarm.sensors
-                if device.temperature_level is not None
-            },
-            "door_window": {
-                device.name: device
-                for device in self.alarm.sensors
-                if device.type == DeviceType.DOORWINDOWSENSOR
-            },
-            "panel": {
-                device.name: device
-                for device in self.alarm.sensors
-                if device.type == DeviceType.PANEL
-            },
-            # "locks": {
-            #     device["deviceLabel"]: device
-            #     for device in overview["doorLockStatusList"]
-            # },
-            # "mice": {
-            #     device["deviceLabel"]: device
-            #     for device in overview["eventCounts"]
-            #     if device["deviceType"] == "MOUSE1"
-            # },
-            # "smart_plugs": {
-            #     device["deviceLabel"]: device for device in overview["smartPlugs"]
-            # },
-        }
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose data changed since they were last notified."""
+        start = time.perf_counter()
+        changed = self._changed_contexts
+        self._changed_contexts = None
+        if changed is None or not self.last_update_success:
+            super().async_update_listeners()
+        else:
+            for update_callback, context in list(self._listeners.values()):
+                if context is None or context in changed:
+                    update_callback()
+                else:
+                    self.suppressed_writes += 1
+        self.metrics.fan_out.observe(time.perf_counter() - start)
+
+    async def async_fetch(
+        self, max_age: float | None = None, command: bool = False
+    ) -> None:
+        """Fetch the status of this installation.
+
+        Callers share a fetch already in flight, and a status fetched less than
+        ``max_age`` seconds ago (``REFRESH_FRESHNESS`` by default) is reused.
+        Fetches confirming a ``command`` get the request budget of commands.
+        """
+        if max_age is None:
+            max_age = REFRESH_FRESHNESS.total_seconds()
+        if self._fetch_task is not None:
+            self.coalesced_fetches += 1
+        elif time.monotonic() - self._fetch_time < max_age:
+            self.coalesced_fetches += 1
+            return
+        else:
+            # Not started eagerly, a fetch that finishes without awaiting
+            # would clear the task before it is stored
+            self._fetch_task = self.hass.async_create_task(
+                self._async_fetch(command),
+                f"{DOMAIN} fetch {self.entry.title}",
+                eager_start=False,
+            )
+        await asyncio.shield(self._fetch_task)
+
+    async def _async_fetch(self, command: bool) -> None:
+        start = time.perf_counter()
+        try:
+            if self.session.async_take_login_status(self.alarm):
+                LOGGER.debug("using data from login")
+            elif not self.breaker.allow():
+                raise CircuitOpenError("G4S is not called while the circuit is open")
+            else:
+                LOGGER.debug("updating data")
+                await self._async_call(
+                    "update_status", self.alarm.update_status, POLL_REQUESTS, command
+                )
+                self.metrics.fetch.observe(time.perf_counter() - start)
+                LOGGER.debug("got new data")
+        except (CircuitOpenError, G4sAuthError):
+            raise
+        except Exception as ex:
+            self.metrics.errors += 1
+            if self.breaker.failure():
+                LOGGER.error(
+                    "Could not update data, retrying in %.0f seconds: %s",
+                    self.breaker.retry_at - time.monotonic(),
+                    ex,
+                )
+            else:
+                LOGGER.debug("Could not update data, %s", ex)
+            raise
+        finally:
+            self._fetch_task = None
+        self.breaker.success()
+        self._fetch_time = time.monotonic()
+        self.metrics.payload_bytes = self.client.state_bytes
+        self.metrics.sensors = len(self.alarm.sensors)
+        self.metrics.users = len(self.alarm.users)
+
+    @callback
+    def _async_handle_error(self, error: BaseException) -> G4sSnapshot:
+        """Keep the last snapshot as stale data, or raise if that is not possible."""
+        if isinstance(error, G4sAuthError):
+            raise ConfigEntryAuthFailed(str(error)) from error
+        if (
+            self.data is None
+            or time.monotonic() - self._data_time > MAX_STALE_AGE.total_seconds()
+        ):
+            self._notify_all = True
+            raise UpdateFailed(str(error)) from error
+        # Write every entity once to show it is stale, and again on recovery
+        self._changed_contexts = set() if self.stale else None
+        self._notify_all = True
+        self.stale = True
+        return self.snapshot
+
+    @callback
+    def async_publish(self, error: BaseException | None = None) -> None:
+        """Publish the result of a poll of the whole account."""
+        try:
+            data = (
+                self._async_update_snapshot()
+                if error is None
+                else self._async_handle_error(error)
+            )
+        except ConfigEntryAuthFailed as ex:
+            self.async_set_update_error(ex)
+            self.entry.async_start_reauth(self.hass)
+        except UpdateFailed as ex:
+            self.async_set_update_error(ex)
+        else:
+            self.async_set_updated_data(data)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll and remember when it is due.
+
+        The first poll is delayed by a random part of the interval, so config
+        entries set up together do not poll in bursts for good.
+        """
+        if self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        offset = self._microsecond  # pylint: disable=access-member-before-definition
+        stagger = 0.0
+        if not self._staggered:
+            self._staggered = True
+            stagger = random.uniform(0, self.update_interval.total_seconds())
+        # The base class adds this offset to every poll, so it is undone after
+        self._microsecond = offset + stagger
+        try:
+            super()._schedule_refresh()
+        finally:
+            self._microsecond = offset
+        self._poll_due = (
+            time.monotonic() + self.update_interval.total_seconds() + stagger
+        )
+
+    async def _async_update_data(self) -> G4sSnapshot:
+        """Fetch data from G4S."""
+        if self._poll_due is not None:
+            jitter = time.monotonic() - self._poll_due
+            # Refreshes requested before the poll was due are not scheduled polls
+            if jitter > -POLL_JITTER_TOLERANCE:
+                self.metrics.poll_jitter.observe(abs(jitter))
+            self._poll_due = None
+        try:
+            await self.session.async_poll(self)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return self._async_handle_error(ex)
+        return self._async_update_snapshot()
+
+    @callback
+    def _async_update_snapshot(self) -> G4sSnapshot:
+        """Update the snapshot from the alarm and track which contexts changed."""
+        start = time.perf_counter()
+        changed = self.snapshot.update(self.alarm)
+        self.codes.update(self.alarm)
+        self.metrics.transform.observe(time.perf_counter() - start)
+        if self.data is not None and any(
+            context[0] == "door_window"
+            for context in changed
+            if isinstance(context, tuple)
+        ):
+            self.async_mark_activity()
+        if self.adaptive_polling:
+            self.update_interval = self._next_update_interval()
+            if self.update_interval != self._reported_interval:
+                self._reported_interval = self.update_interval
+                changed.add(ALARM_CONTEXT)
+
+        if self.snapshot.transitions:
+            self._async_record_transitions()
+        if self.snapshot.added:
+            self._async_migrate_legacy_ids()
+        if self.data is not None and (self.snapshot.added or self.snapshot.removed):
+            self._async_dispatch_device_changes()
+        if changed:
+            self._store.async_delay_save(
+                self.snapshot.as_dict, SNAPSHOT_SAVE_DELAY.total_seconds()
+            )
+
+        self._async_apply_deadband(changed)
+
+        # Entities were unavailable or stale, so all of them must be written
+        self._changed_contexts = None if self._notify_all else changed
+        self._notify_all = False
+        self.stale = False
+        self._data_time = time.monotonic()
+        return self.snapshot
+
+    @callback
+    def _async_apply_deadband(self, changed: set[object]) -> None:
+        """Hold back climate readings within the deadband of the last written one.
+
+        The held back readings are counted by ``async_update_listeners``.
+        """
+        reported = self.reported_climate
+        for context in self.snapshot.removed:
+            reported.pop(context, None)
+        climate = [
+            context
+            for context in changed
+            if isinstance(context, tuple) and context[0] in CLIMATE_FIELDS
+        ]
+        for context in climate:
+            category, key = context
+            if (record := getattr(self.snapshot, category).get(key)) is None:
+                continue
+            if (value := getattr(record, CLIMATE_FIELDS[category])) is None:
+                # The entity is unavailable, the next reading is written
+                reported.pop(context, None)
+            elif (
+                (last := reported.get(context)) is None
+                or context in self.snapshot.added
+                or abs(value - last) >= self.climate_deadband
+            ):
+                reported[context] = value
+            else:
+                changed.discard(context)
+
+    @callback
+    def _async_dispatch_device_changes(self) -> None:
+        """Let the platforms add and remove entities for the devices that changed."""
+        snapshot = self.snapshot
+        entry_id = self.entry.entry_id
+        if snapshot.added:
+            LOGGER.debug("Devices added: %s", snapshot.added)
+            async_dispatcher_send(
+                self.hass, SIGNAL_DEVICES_ADDED.format(entry_id), snapshot.added
+            )
+        if snapshot.removed:
+            LOGGER.debug("Devices removed: %s", snapshot.removed)
+            async_dispatcher_send(
+                self.hass, SIGNAL_DEVICES_REMOVED.format(entry_id), snapshot.removed
+            )
+            device_registry = dr.async_get(self.hass)
+            for _, key in snapshot.removed:
+                if key in snapshot.devices:
+                    continue
+                self._device_infos.pop(key, None)
+                device = device_registry.async_get_device(identifiers={(DOMAIN, key)})
+                if device is not None:
+                    device_registry.async_update_device(
+                        device.id, remove_config_entry_id=entry_id
+                    )
+
+    @callback
+    def _async_migrate_legacy_ids(self) -> None:
+        """Move the entities and devices of added devices off their legacy keys.
+
+        Older versions keyed devices by name, so the unique ids were
+        ``{name}_{category}`` and the device identifiers the name. The first
+        added device with a name takes over what was registered under it.
+        Devices without a serial number were keyed by their id alone.
+        """
+        added = {key for _, key in self.snapshot.added}
+        prefix = f"{self.snapshot.giid}_"
+        keys: dict[str, str] = {}
+        for key in added:
+            if key.startswith(prefix):
+                keys[key.removeprefix(prefix)] = key
+        for key, record in self.snapshot.devices.items():
+            if key in added and record.name != key:
+                keys.setdefault(record.name, key)
+        if not keys:
+            return
+
+        entity_registry = er.async_get(self.hass)
+        for entity in er.async_entries_for_config_entry(
+            entity_registry, self.entry.entry_id
+        ):
+            name, _, suffix = entity.unique_id.rpartition("_")
+            # Categories may hold an underscore, as in door_window
+            while name and name not in keys:
+                name, _, rest = name.rpartition("_")
+                suffix = f"{rest}_{suffix}"
+            if not name:
+                continue
+            unique_id = f"{keys[name]}_{suffix}"
+            if entity_registry.async_get_entity_id(entity.domain, DOMAIN, unique_id):
+                continue
+            LOGGER.debug("Migrating %s to unique id %s", entity.entity_id, unique_id)
+            entity_registry.async_update_entity(
+                entity.entity_id, new_unique_id=unique_id
+            )
+
+        device_registry = dr.async_get(self.hass)
+        for name, key in keys.items():
+            device = device_registry.async_get_device(identifiers={(DOMAIN, name)})
+            if device is not None and not device_registry.async_get_device(
+                identifiers={(DOMAIN, key)}
+            ):
+                device_registry.async_update_device(
+                    device.id, new_identifiers={(DOMAIN, key)}
+                )
+
+    @callback
+    def _async_record_transitions(self) -> None:
+        """Add the events of the last update to the history and the logbook."""
+        now = time.time()
+        for kind, key, state, user, name in self.snapshot.transitions:
+            event_time = now
+            if kind == ALARM_CONTEXT and self.alarm.last_state_change is not None:
+                event_time = self.alarm.last_state_change.timestamp()
+            event = G4sEvent(event_time, kind, key, state, user, name)
+            self.history.async_record(event)
+            self.hass.bus.async_fire(
+                EVENT_G4S_ALARM,
+                {ATTR_CONFIG_ENTRY_ID: self.entry.entry_id, **event.as_dict()},
+            )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Load the last stored snapshot, marking it stale until the next poll."""
+        if (data := await self._store.async_load()) is None:
+            return False
+        try:
+            self.snapshot.restore(data)
+        except (KeyError, TypeError, ValueError) as ex:
+            LOGGER.warning("Ignoring invalid stored G4S snapshot: %s", ex)
+            self.snapshot = G4sSnapshot(self.entry.data[CONF_GIID])
+            return False
+        self.stale = True
+        self._notify_all = True
+        self._data_time = time.monotonic()
+        self.async_set_updated_data(self.snapshot)
+        return True
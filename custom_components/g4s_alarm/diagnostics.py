@@ -0,0 +1,55 @@
+"""Diagnostics support for G4S."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import G4sDataUpdateCoordinator
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinators: list[G4sDataUpdateCoordinator] = list(hass.data[DOMAIN].values())
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "options": dict(entry.options),
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "circuit": coordinator.breaker.state.value,
+        "consecutive_failures": coordinator.breaker.failures,
+        "suppressed_writes": coordinator.suppressed_writes,
+        "coalesced_fetches": coordinator.coalesced_fetches,
+        "coalesced_polls": coordinator.session.coalesced_polls,
+        "request_budget": {
+            "remaining": coordinator.budget.remaining,
+            "throttled": coordinator.budget.throttled,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "reported_climate": {
+            f"{category} {key}": value
+            for (category, key), value in coordinator.reported_climate.items()
+        },
+        # Load of all G4S config entries, to compare nodes and releases
+        "node": {
+            "entries": len(coordinators),
+            "devices": sum(len(other.snapshot.devices) for other in coordinators),
+            "loop_lag": coordinator.probe.loop_lag.as_dict(),
+            "executor_wait": coordinator.probe.executor_wait.as_dict(),
+            "fallback_pending": sum(
+                other.metrics.fallback_pending for other in coordinators
+            ),
+        },
+    }
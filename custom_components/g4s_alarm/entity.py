@@ -0,0 +1,144 @@
+"""Base entity for the devices of a G4S installation."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    ATTR_STALE,
+    DOMAIN,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+)
+from .coordinator import G4sDataUpdateCoordinator
+from .models import VALUE_FIELDS
+
+
+class G4sDeviceEntity(CoordinatorEntity):
+    """An entity of a device in one category of the snapshot.
+
+    The entity is unavailable while its device is missing from the polls or its
+    value is unknown, and removes itself once the device leaves the category.
+    """
+
+    coordinator: G4sDataUpdateCoordinator
+
+    # Appended to the device name to name the entity
+    _suffix: str | None = None
+
+    def __init__(
+        self,
+        coordinator: G4sDataUpdateCoordinator,
+        category: str,
+        serial_number: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, context=(category, serial_number))
+        self._device = getattr(coordinator.data, category)[serial_number]
+        self._field = VALUE_FIELDS[category]
+        self.serial_number = serial_number
+        self._async_update_metadata()
+
+    @callback
+    def _async_update_metadata(self) -> None:
+        """Copy the name and device info from the metadata cache."""
+        self._attr_device_info = self.coordinator.async_get_device_info(self._device)
+        self._attr_name = (
+            self._device.name
+            if self._suffix is None
+            else f"{self._device.name} {self._suffix}"
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the metadata if the device was renamed or changed type."""
+        if (
+            self.coordinator.async_get_device_info(self._device)
+            is not self._attr_device_info
+        ):
+            self._async_update_metadata()
+        super()._handle_coordinator_update()
+
+    async def async_added_to_hass(self) -> None:
+        """Remove the entity when its device is removed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICES_REMOVED.format(self.coordinator.entry.entry_id),
+                self._async_devices_removed,
+            )
+        )
+
+    @callback
+    def _async_devices_removed(self, contexts: set[tuple[str, str]]) -> None:
+        if self.coordinator_context not in contexts:
+            return
+        if self.registry_entry is not None:
+            er.async_get(self.hass).async_remove(self.entity_id)
+        else:
+            self.hass.async_create_task(self.async_remove(force_remove=True))
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return (
+            super().available
+            and self._device.present
+            and (self._field is None or getattr(self._device, self._field) is not None)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool] | None:
+        """Return the state of the entity."""
+        if self.coordinator.stale:
+            return {ATTR_STALE: True}
+        return None
+
+
+# Creates the entity of a device from the coordinator and the device key
+DeviceEntityFactory = Callable[[G4sDataUpdateCoordinator, str], G4sDeviceEntity]
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    entity_types: dict[str, DeviceEntityFactory],
+) -> None:
+    """Add an entity per device of each category, now and as devices are added.
+
+    ``entity_types`` maps snapshot categories to the entities of the platform.
+    """
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def _async_add_entities(contexts: set[tuple[str, str]]) -> None:
+        async_add_entities(
+            [
+                entity_types[category](coordinator, serial_number)
+                for category, serial_number in contexts
+                if category in entity_types
+            ]
+        )
+
+    _async_add_entities(
+        {
+            (category, serial_number)
+            for category in entity_types
+            for serial_number in getattr(coordinator.data, category)
+        }
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_entities
+        )
+    )
@@ -0,0 +1,142 @@
+"""Event history of a G4S installation."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import os
+from collections import deque
+from contextlib import suppress
+from itertools import islice
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, HISTORY_SIZE, LOGGER
+
+
+class G4sEvent(NamedTuple):
+    """An alarm state change or a change of a door/window or detector."""
+
+    time: float
+    kind: str
+    key: str | None
+    state: Any
+    user: str | None
+    # Name of the device, events recorded by older versions have none
+    name: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the event as JSON serializable dict."""
+        return {
+            "time": self.time,
+            "kind": self.kind,
+            "key": self.key,
+            "state": self.state,
+            "user": self.user,
+            "name": self.name,
+        }
+
+
+class G4sHistory:
+    """The last ``HISTORY_SIZE`` events of an installation.
+
+    Events are kept in time order in a ring buffer, so time ranges are found
+    by bisection. New events are appended to a JSON lines file, which is only
+    rewritten once it holds twice as many lines as the buffer.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an empty history."""
+        self.hass = hass
+        self.path = hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.history")
+        self.events: deque[G4sEvent] = deque(maxlen=HISTORY_SIZE)
+        self._lines = 0
+        self._pending: list[G4sEvent] = []
+        self._write_task: asyncio.Task[None] | None = None
+
+    def _read(self) -> list[G4sEvent]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        self._lines = len(lines)
+        events = []
+        for line in lines[-HISTORY_SIZE:]:
+            try:
+                events.append(G4sEvent(*json.loads(line)))
+            except (TypeError, ValueError):
+                # A line cut short by a crash while appending
+                continue
+        return events
+
+    async def async_load(self) -> None:
+        """Load the stored events."""
+        self.events.extend(await self.hass.async_add_executor_job(self._read))
+
+    @callback
+    def async_record(self, event: G4sEvent) -> None:
+        """Add an event, keeping the buffer in time order."""
+        if self.events and event.time < self.events[-1].time:
+            event = event._replace(time=self.events[-1].time)
+        self.events.append(event)
+        self._pending.append(event)
+        if self._write_task is None:
+            self._write_task = self.hass.async_create_task(
+                self._async_write(), f"{DOMAIN} history write"
+            )
+
+    async def _async_write(self) -> None:
+        try:
+            while self._pending:
+                events, self._pending = self._pending, []
+                if self._lines + len(events) > 2 * HISTORY_SIZE:
+                    events = list(self.events)
+                    rewrite = True
+                else:
+                    rewrite = False
+                await self.hass.async_add_executor_job(self._write, events, rewrite)
+        except OSError as ex:
+            LOGGER.warning("Could not write the G4S event history: %s", ex)
+        finally:
+            self._write_task = None
+
+    def _write(self, events: list[G4sEvent], rewrite: bool) -> None:
+        lines = "".join(f"{json.dumps(event)}\n" for event in events)
+        if rewrite:
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as file:
+                file.write(lines)
+            os.replace(f"{self.path}.tmp", self.path)
+            self._lines = len(events)
+        else:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(lines)
+            self._lines += len(events)
+
+    def between(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[G4sEvent]:
+        """Return the events from ``start`` up to and including ``end``."""
+        events = self.events
+        low = 0 if start is None else bisect.bisect_left(events, start, key=_time)
+        high = (
+            len(events) if end is None else bisect.bisect_right(events, end, key=_time)
+        )
+        return list(islice(events, low, high))
+
+    async def async_remove(self) -> None:
+        """Remove the stored events."""
+
+        def _remove() -> None:
+            with suppress(FileNotFoundError):
+                os.remove(self.path)
+
+        await self.hass.async_add_executor_job(_remove)
+
+
+def _time(event: G4sEvent) -> float:
+    return event.time
@@ -0,0 +1,47 @@
+"""Describe G4S events in the logbook."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.components.logbook import (
+    LOGBOOK_ENTRY_MESSAGE,
+    LOGBOOK_ENTRY_NAME,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN, EVENT_G4S_ALARM
+from .models import ALARM_CONTEXT
+
+# Messages of the device events of each category when off and on
+EVENT_MESSAGES = {
+    "door_window": ("closed", "opened"),
+    "smoke": ("cleared smoke alarm", "detected smoke"),
+    "siren": ("cleared its alarm", "triggered the alarm"),
+    "motion": ("cleared its alarm", "triggered the alarm"),
+}
+
+
+@callback
+def async_describe_events(
+    hass: HomeAssistant,
+    async_describe_event: Callable[[str, str, Callable[[Event], dict[str, str]]], None],
+) -> None:
+    """Describe the events recorded in the G4S history."""
+
+    @callback
+    def async_describe_g4s_event(event: Event) -> dict[str, str]:
+        """Describe an alarm state change or a door/window event."""
+        data = event.data
+        if data["kind"] == ALARM_CONTEXT:
+            entry = hass.config_entries.async_get_entry(data[ATTR_CONFIG_ENTRY_ID])
+            name = "G4S" if entry is None else entry.title
+            message = f"changed to {data['state'].lower().replace('_', ' ')}"
+            if data["user"] is not None:
+                message = f"{message} by {data['user']}"
+        else:
+            name = data.get("name") or data["key"]
+            message = EVENT_MESSAGES[data["kind"]][bool(data["state"])]
+        return {LOGBOOK_ENTRY_NAME: name, LOGBOOK_ENTRY_MESSAGE: message}
+
+    async_describe_event(DOMAIN, EVENT_G4S_ALARM, async_describe_g4s_event)
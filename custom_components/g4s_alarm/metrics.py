@@ -0,0 +1,102 @@
+"""Performance metrics of the G4S coordinator."""
+
+from __future__ import annotations
+
+import bisect
+from typing import Any
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class G4sHistogram:
+    """Latency histogram with fixed buckets."""
+
+    __slots__ = ("counts", "count", "total", "last", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # The last bucket counts everything above the largest bound
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as JSON serializable dict."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "last": self.last,
+            "max": self.max,
+            "buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.counts)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class G4sMetrics:
+    """Counters and latencies of a coordinator."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    __slots__ = (
+        "fetch",
+        "transform",
+        "fan_out",
+        "poll_jitter",
+        "fallback_pending",
+        "fallback_pending_max",
+        "errors",
+        "retries",
+        "payload_bytes",
+        "sensors",
+        "users",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.fetch = G4sHistogram()
+        self.transform = G4sHistogram()
+        self.fan_out = G4sHistogram()
+        # How far a scheduled poll started from its due time
+        self.poll_jitter = G4sHistogram()
+        # Calls of the g4s library fallback in the executor, not yet finished.
+        # The asyncio client does not use the executor, so these stay 0 while
+        # it works. The load of the executor is measured by the loop probe.
+        self.fallback_pending = 0
+        self.fallback_pending_max = 0
+        self.errors = 0
+        self.retries = 0
+        self.payload_bytes: int | None = None
+        self.sensors: int | None = None
+        self.users: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as JSON serializable dict."""
+        return {
+            "fetch": self.fetch.as_dict(),
+            "transform": self.transform.as_dict(),
+            "fan_out": self.fan_out.as_dict(),
+            "poll_jitter": self.poll_jitter.as_dict(),
+            "fallback_pending": self.fallback_pending,
+            "fallback_pending_max": self.fallback_pending_max,
+            "errors": self.errors,
+            "retries": self.retries,
+            "payload_bytes": self.payload_bytes,
+            "sensors": self.sensors,
+            "users": self.users,
+        }
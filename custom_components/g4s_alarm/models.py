@@ -0,0 +1,414 @@
+"""Snapshot of a G4S installation, built in a single pass per poll."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+from typing import TYPE_CHECKING, Any
+
+from .const import DEVICE_REMOVAL_POLLS
+
+if TYPE_CHECKING:
+    from g4s import Alarm
+    from g4s.utils.state_device import StateDevice
+
+ALARM_CONTEXT = "alarm"
+
+# Record field holding the value of the entities of each category, the
+# entities are unavailable while it is None
+VALUE_FIELDS = {
+    "climate": "temperature_level",
+    "humidity": "humidity_level",
+    "door_window": "is_open",
+    "panel": None,
+    "smoke": "is_triggered",
+    "siren": "is_triggered",
+    "motion": "is_triggered",
+    "battery": "battery_level",
+    "signal": "rf_level",
+    "tamper": "is_tampered",
+}
+
+# Record fields shown by the entities of each category
+CATEGORY_FIELDS = {
+    category: frozenset({"name", "device_type"} | ({field} if field else set()))
+    for category, field in VALUE_FIELDS.items()
+}
+
+# Category of the devices of each ``DeviceType``, by name. Hubs, Z-Wave
+# controllers and access chips have no entities of their own.
+DEVICE_TYPE_CATEGORY = {
+    "DOORWINDOWSENSOR": "door_window",
+    "PANEL": "panel",
+    "SMOKEALARM": "smoke",
+    "SIREN": "siren",
+    "CAMERA": "motion",
+}
+
+# Categories of readings, devices join them once they report the reading
+READING_CATEGORIES = frozenset({"climate", "humidity", "battery", "signal", "tamper"})
+
+# Reading of the devices of each climate category
+CLIMATE_FIELDS = {"climate": "temperature_level", "humidity": "humidity_level"}
+
+# Keys of the humidity reading in the ``attributes`` or ``additionalData`` of a
+# device, which the g4s library passes on as is
+HUMIDITY_KEYS = ("humidityLevel", "humidity")
+
+# Field of the devices of each category whose changes are history events
+EVENT_FIELDS = {
+    "door_window": "is_open",
+    "smoke": "is_triggered",
+    "siren": "is_triggered",
+    "motion": "is_triggered",
+}
+
+
+def device_key(device: StateDevice, giid: str) -> str:
+    """Return the key of a device, unique across installations.
+
+    Names are not unique, a door sensor and a smoke detector may both be
+    called "Hall". Devices without a serial number fall back to their id,
+    which is only unique within the installation ``giid``.
+    """
+    return device.serial_number or f"{giid}_{device.id}"
+
+
+def _humidity_level(device: StateDevice) -> float | None:
+    """Return the humidity reading of a device, if it reports a number."""
+    for data in (device.attributes, device.additional_data):
+        if isinstance(data, dict):
+            for key in HUMIDITY_KEYS:
+                if (value := data.get(key)) is not None:
+                    # The attributes are free-form, the deadband needs a number
+                    try:
+                        return float(value)
+                    except (TypeError, ValueError):
+                        continue
+    return None
+
+
+class G4sDevice:
+    """Latest values of a single G4S device.
+
+    Records are updated in place, so entities can keep a reference to theirs.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    __slots__ = (
+        "key",
+        "name",
+        "device_type",
+        "is_open",
+        "temperature_level",
+        "humidity_level",
+        "battery_level",
+        "rf_level",
+        "is_tampered",
+        "is_triggered",
+        "present",
+        "missed",
+    )
+
+    # Fields copied from the device, in the order of ``update``
+    FIELDS = (
+        "name",
+        "device_type",
+        "is_open",
+        "temperature_level",
+        "humidity_level",
+        "battery_level",
+        "rf_level",
+        "is_tampered",
+        "is_triggered",
+    )
+
+    def __init__(self, key: str) -> None:
+        """Initialize an empty record."""
+        self.key = key
+        self.name: str = key
+        # Name of the ``g4s.utils.enums.DeviceType`` of the device
+        self.device_type = "UNKNOWN"
+        self.is_open: bool | None = None
+        self.temperature_level: int | None = None
+        self.humidity_level: float | None = None
+        self.battery_level: int | None = None
+        self.rf_level: int | None = None
+        self.is_tampered: bool | None = None
+        self.is_triggered: bool | None = None
+        self.present = False
+        # Polls in a row the device was missing from
+        self.missed = 0
+
+    def update(self, device: StateDevice) -> set[str]:
+        """Copy the values of ``device``, returning the fields that changed."""
+        values = (
+            device.name,
+            device.type.name,
+            device.is_open,
+            device.temperature_level,
+            _humidity_level(device),
+            device.battery_level,
+            device.rf_level,
+            device.is_tampered,
+            device.is_triggered_alarm,
+        )
+        current = (
+            self.name,
+            self.device_type,
+            self.is_open,
+            self.temperature_level,
+            self.humidity_level,
+            self.battery_level,
+            self.rf_level,
+            self.is_tampered,
+            self.is_triggered,
+        )
+        if not self.present:
+            changed = set(self.FIELDS)
+        elif values == current:
+            return set()
+        else:
+            changed = {
+                field
+                for field, old, new in zip(self.FIELDS, current, values)
+                if old != new
+            }
+        (
+            self.name,
+            self.device_type,
+            self.is_open,
+            self.temperature_level,
+            self.humidity_level,
+            self.battery_level,
+            self.rf_level,
+            self.is_tampered,
+            self.is_triggered,
+        ) = values
+        self.present = True
+        self.missed = 0
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as JSON serializable dict."""
+        return {
+            "key": self.key,
+            **{field: getattr(self, field) for field in self.FIELDS},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> G4sDevice:
+        """Create a record from the output of ``as_dict``."""
+        record = cls(data["key"])
+        if not isinstance(data["device_type"], str):
+            raise TypeError(f"Invalid device type {data['device_type']!r}")
+        for field in cls.FIELDS:
+            # Fields added after the snapshot was stored are left empty
+            setattr(record, field, data.get(field, getattr(record, field)))
+        record.present = True
+        return record
+
+
+class G4sSnapshot:
+    """All devices of an installation indexed by category and key.
+
+    Every category of ``CATEGORY_FIELDS`` is a dict of the records in it.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    __slots__ = (
+        "giid",
+        "alarm",
+        "changed_by",
+        "devices",
+        *CATEGORY_FIELDS,
+        "transitions",
+        "added",
+        "removed",
+    )
+
+    def __init__(self, giid: str) -> None:
+        """Initialize an empty snapshot of the installation ``giid``."""
+        self.giid = giid
+        self.alarm: str | None = None
+        self.changed_by: str | None = None
+        self.devices: dict[str, G4sDevice] = {}
+        self.climate: dict[str, G4sDevice] = {}
+        self.humidity: dict[str, G4sDevice] = {}
+        self.door_window: dict[str, G4sDevice] = {}
+        self.panel: dict[str, G4sDevice] = {}
+        self.battery: dict[str, G4sDevice] = {}
+        self.signal: dict[str, G4sDevice] = {}
+        self.tamper: dict[str, G4sDevice] = {}
+        self.smoke: dict[str, G4sDevice] = {}
+        self.siren: dict[str, G4sDevice] = {}
+        self.motion: dict[str, G4sDevice] = {}
+        # (kind, key, state, user, name) of the events seen by the last update
+        self.transitions: list[tuple[str, str | None, Any, str | None, str | None]] = []
+        # (category, key) of the devices that joined or left a category
+        self.added: set[tuple[str, str]] = set()
+        self.removed: set[tuple[str, str]] = set()
+
+    def _index(self, record: G4sDevice, fields: set[str]) -> set[object]:
+        """Put ``record`` in the categories it belongs to.
+
+        A device stays in the category of a reading when the reading goes
+        missing, its entity is unavailable until the reading is back. It only
+        leaves the category of its type if the type changes.
+
+        Returns the contexts of the categories that show one of ``fields``.
+        """
+        changed: set[object] = set()
+        type_category = DEVICE_TYPE_CATEGORY.get(record.device_type)
+        for category, fields_shown in CATEGORY_FIELDS.items():
+            index: dict[str, G4sDevice] = getattr(self, category)
+            if record.key in index:
+                if category not in READING_CATEGORIES and category != type_category:
+                    del index[record.key]
+                    self.removed.add((category, record.key))
+                    changed.add((category, record.key))
+                elif not fields.isdisjoint(fields_shown):
+                    changed.add((category, record.key))
+            elif category == type_category or (
+                category in READING_CATEGORIES
+                and getattr(record, VALUE_FIELDS[category]) is not None
+            ):
+                index[record.key] = record
+                self.added.add((category, record.key))
+                changed.add((category, record.key))
+        return changed
+
+    def _expire(self, seen: set[str]) -> set[object]:
+        """Mark the devices missing from the poll, removing those long gone.
+
+        Devices are removed once missing from ``DEVICE_REMOVAL_POLLS`` polls in
+        a row. Returns the contexts whose availability changed.
+        """
+        changed: set[object] = set()
+        for key in self.devices.keys() - seen:
+            record = self.devices[key]
+            record.present = False
+            record.missed += 1
+            removed = record.missed >= DEVICE_REMOVAL_POLLS
+            if removed:
+                del self.devices[key]
+            elif record.missed > 1:
+                continue
+            for category in CATEGORY_FIELDS:
+                index: dict[str, G4sDevice] = getattr(self, category)
+                if key in index:
+                    changed.add((category, key))
+                    if removed:
+                        del index[key]
+                        self.removed.add((category, key))
+        return changed
+
+    def update(self, alarm: Alarm) -> set[object]:
+        """Update from ``alarm``, returning the listener contexts that changed."""
+        changed: set[object] = set()
+        seen: set[str] = set()
+        self.transitions = []
+        self.added = set()
+        self.removed = set()
+
+        for device in alarm.sensors:
+            key = device_key(device, self.giid)
+            seen.add(key)
+            record = self.devices.get(key)
+            if record is None:
+                record = self.devices[key] = G4sDevice(key)
+            was_present = record.present
+            if fields := record.update(device):
+                changed.update(self._index(record, fields))
+                category = DEVICE_TYPE_CATEGORY.get(record.device_type)
+                field = EVENT_FIELDS.get(category)
+                if was_present and field in fields:
+                    self.transitions.append(
+                        (
+                            category,
+                            record.key,
+                            getattr(record, field),
+                            None,
+                            record.name,
+                        )
+                    )
+
+        if len(seen) != len(self.devices):
+            changed.update(self._expire(seen))
+
+        try:
+            changed_by = alarm.last_state_change_by.name
+        except AttributeError:
+            changed_by = None
+        if (self.alarm, self.changed_by) != (alarm.state.name, changed_by):
+            changed.add(ALARM_CONTEXT)
+            if self.alarm is not None and self.alarm != alarm.state.name:
+                self.transitions.append(
+                    (ALARM_CONTEXT, None, alarm.state.name, changed_by, None)
+                )
+            self.alarm = alarm.state.name
+            self.changed_by = changed_by
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as JSON serializable dict."""
+        return {
+            "alarm": self.alarm,
+            "changed_by": self.changed_by,
+            "devices": [record.as_dict() for record in self.devices.values()],
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the snapshot from the output of ``as_dict``."""
+        self.alarm = data["alarm"]
+        self.changed_by = data["changed_by"]
+        for device in data["devices"]:
+            record = self.devices[device["key"]] = G4sDevice.from_dict(device)
+            self._index(record, set(G4sDevice.FIELDS))
+
+
+class G4sCodeIndex:
+    """Salted hashes of the user and access chip codes of an installation.
+
+    Codes are hashed with a per-instance random salt, so lookups are a set
+    membership test. The sources of the last update are kept to find the
+    codes that changed, the alarm of the g4s library holds them anyway.
+    """
+
+    __slots__ = ("_salt", "_sources", "_digests", "_codes")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._salt = secrets.token_bytes(16)
+        self._sources: tuple[tuple[str, int, str | None], ...] = ()
+        # Digest per (source, id, code), so unchanged codes are reused
+        self._digests: dict[tuple[str, int, str], bytes] = {}
+        self._codes: frozenset[bytes] = frozenset()
+
+    def _digest(self, code: str) -> bytes:
+        return hmac.new(self._salt, code.encode(), hashlib.sha256).digest()
+
+    def update(self, alarm: Alarm) -> None:
+        """Rehash the codes that changed since the last update."""
+        sources = [("user", user.id, user.access_code) for user in alarm.users]
+        sources.extend(
+            ("chip", chip.id, chip.access_code)
+            for chip in alarm.sensors
+            if chip.type.name == "ACCESSCHIP"
+        )
+        if (current := tuple(sources)) == self._sources:
+            return
+        self._sources = current
+        digests: dict[tuple[str, int, str], bytes] = {}
+        for source in sources:
+            if source[2] is not None:
+                digests[source] = self._digests.get(source) or self._digest(source[2])
+        self._digests = digests
+        self._codes = frozenset(digests.values())
+
+    def validate(self, code: str | None) -> bool:
+        """Return True if ``code`` belongs to a user or an access chip."""
+        return code is not None and self._digest(code) in self._codes
@@ -0,0 +1,86 @@
+"""Event loop and executor probe shared by all G4S config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_LOOP_PROBE, LOOP_PROBE_INTERVAL
+from .metrics import G4sHistogram
+
+
+class G4sLoopProbe:
+    """Timer measuring how busy the event loop and the executor are.
+
+    Every ``LOOP_PROBE_INTERVAL`` the probe records how late its timer ran,
+    which is the time the loop spent on other work, and how long a no-op
+    executor job waited for a thread. It is independent of the polls, so it
+    measures a healthy node as well. It only runs while something registered
+    for it, such as an enabled loop lag sensor, as it adds work of its own.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a stopped probe."""
+        self.hass = hass
+        self.loop_lag = G4sHistogram()
+        self.executor_wait = G4sHistogram()
+        self._entries = 0
+        self._due = 0.0
+        self._cancel: CALLBACK_TYPE | None = None
+        self._executor_job: asyncio.Future[float] | None = None
+        self._job = HassJob(self._async_tick, cancel_on_shutdown=True)
+
+    @callback
+    def async_register(self) -> CALLBACK_TYPE:
+        """Run the probe until the returned callback is called."""
+        self._entries += 1
+        if self._cancel is None:
+            self._async_schedule()
+
+        @callback
+        def _async_unregister() -> None:
+            self._entries -= 1
+            if not self._entries and self._cancel is not None:
+                self._cancel()
+                self._cancel = None
+
+        return _async_unregister
+
+    @callback
+    def _async_schedule(self) -> None:
+        self._due = self.hass.loop.time() + LOOP_PROBE_INTERVAL.total_seconds()
+        self._cancel = async_call_later(self.hass, LOOP_PROBE_INTERVAL, self._job)
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        self.loop_lag.observe(max(self.hass.loop.time() - self._due, 0.0))
+        # A job still waiting for a thread is measured when it gets one
+        if self._executor_job is None:
+            submitted = time.monotonic()
+            self._executor_job = self.hass.loop.run_in_executor(None, time.monotonic)
+            self._executor_job.add_done_callback(
+                lambda job: self._async_observe_executor(job, submitted)
+            )
+        self._async_schedule()
+
+    @callback
+    def _async_observe_executor(
+        self, job: asyncio.Future[float], submitted: float
+    ) -> None:
+        self._executor_job = None
+        if not job.cancelled() and job.exception() is None:
+            self.executor_wait.observe(job.result() - submitted)
+
+
+@callback
+def async_get_loop_probe(hass: HomeAssistant) -> G4sLoopProbe:
+    """Return the loop probe of this Home Assistant instance."""
+    if (probe := hass.data.get(DATA_LOOP_PROBE)) is None:
+        probe = hass.data[DATA_LOOP_PROBE] = G4sLoopProbe(hass)
+    return probe
@@ -2,18 +2,88 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from collections.abc import Callable
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_BATTERY_LEVEL, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_GIID, DEVICE_TYPE_NAME, DOMAIN
+from .const import CONF_GIID, DOMAIN
 from .coordinator import G4sDataUpdateCoordinator
+from .entity import (
+    DeviceEntityFactory,
+    G4sDeviceEntity,
+    async_setup_device_entities,
+)
+
+# Name, unit, state class and value of the diagnostic metric sensors
+METRIC_SENSORS: dict[
+    str,
+    tuple[
+        str,
+        str | None,
+        SensorStateClass,
+        Callable[[G4sDataUpdateCoordinator], float | int | None],
+    ],
+] = {
+    "fetch_latency": (
+        "Fetch latency",
+        UnitOfTime.SECONDS,
+        SensorStateClass.MEASUREMENT,
+        lambda coordinator: coordinator.metrics.fetch.last,
+    ),
+    "fetch_errors": (
+        "Fetch errors",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda coordinator: coordinator.metrics.errors,
+    ),
+    "device_count": (
+        "Device count",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda coordinator: coordinator.metrics.sensors,
+    ),
+    "suppressed_writes": (
+        "Suppressed state writes",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda coordinator: coordinator.suppressed_writes,
+    ),
+    "request_budget": (
+        "Remaining request budget",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda coordinator: coordinator.budget.remaining,
+    ),
+    "loop_lag": (
+        "Event loop lag",
+        UnitOfTime.SECONDS,
+        SensorStateClass.MEASUREMENT,
+        lambda coordinator: coordinator.probe.loop_lag.last,
+    ),
+    "executor_wait": (
+        "Executor wait",
+        UnitOfTime.SECONDS,
+        SensorStateClass.MEASUREMENT,
+        lambda coordinator: coordinator.probe.executor_wait.last,
+    ),
+}
+
+# Metric sensors measured by the loop probe, which runs while one is enabled
+PROBE_METRICS = {"loop_lag", "executor_wait"}
 
 
 async def async_setup_entry(
@@ -24,72 +94,146 @@ async def async_setup_entry(
     """Set up G4S sensors based on a config entry."""
     coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    sensors: list[Entity] = [
-        G4sThermometer(coordinator, serial_number)
-        for serial_number, values in coordinator.data["climate"].items()
-        if values.temperature_level is not None
-    ]
+    async_setup_device_entities(hass, entry, async_add_entities, DEVICE_SENSORS)
 
-    async_add_entities(sensors)
+    async_add_entities([G4sMetricSensor(coordinator, key) for key in METRIC_SENSORS])
 
 
-class G4sThermometer(CoordinatorEntity, SensorEntity):
-    """Representation of a G4S thermometer."""
+class G4sClimateSensor(G4sDeviceEntity, SensorEntity):
+    """A climate reading of a G4S device, written through the deadband."""
 
-    coordinator: G4sDataUpdateCoordinator
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    # Snapshot category of the reading
+    _category: str
+
+    def __init__(
+        self, coordinator: G4sDataUpdateCoordinator, serial_number: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, self._category, serial_number)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last reading written, see ``climate_deadband``."""
+        reported = self.coordinator.reported_climate.get(self.coordinator_context)
+        if reported is None:
+            return getattr(self._device, self._field)
+        return reported
+
+
+class G4sThermometer(G4sClimateSensor):
+    """Representation of a G4S thermometer."""
 
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _category = "climate"
+    _suffix = "Temperature"
 
     def __init__(
         self, coordinator: G4sDataUpdateCoordinator, serial_number: str
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, serial_number)
         self._attr_unique_id = f"{serial_number}_temperature"
-        self.serial_number = serial_number
 
-    @property
-    def name(self) -> str:
-        """Return the name of the entity."""
-        name = self.coordinator.data["climate"][self.serial_number].name
-        return f"{name} Temperature"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this entity."""
-        device_type = self.coordinator.data["climate"][self.serial_number].type.name
-        area = self.coordinator.data["climate"][self.serial_number].name
-        return {
-            "name": area,
-            "suggested_area": area,
-            "manufacturer": "G4S",
-            "model": DEVICE_TYPE_NAME.get(device_type, device_type),
-            "identifiers": {(DOMAIN, self.serial_number)},
-            "via_device": (DOMAIN, self.coordinator.entry.data[CONF_GIID]),
-        }
+class G4sHygrometer(G4sClimateSensor):
+    """Humidity reading of a G4S climate sensor."""
+
+    _attr_device_class = SensorDeviceClass.HUMIDITY
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _category = "humidity"
+    _suffix = "Humidity"
+
+    def __init__(
+        self, coordinator: G4sDataUpdateCoordinator, serial_number: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial_number)
+        self._attr_unique_id = f"{serial_number}_humidity"
+
+
+class G4sBatterySensor(G4sDeviceEntity, SensorEntity):
+    """Battery level of a G4S device."""
+
+    _attr_device_class = SensorDeviceClass.BATTERY
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _suffix = "Battery"
+
+    def __init__(
+        self, coordinator: G4sDataUpdateCoordinator, serial_number: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "battery", serial_number)
+        self._attr_unique_id = f"{serial_number}_battery"
 
     @property
-    def native_value(self) -> str | None:
+    def native_value(self) -> int | None:
         """Return the state of the entity."""
-        return self.coordinator.data["climate"][self.serial_number].temperature_level
+        return self._device.battery_level
+
+
+class G4sSignalSensor(G4sDeviceEntity, SensorEntity):
+    """Radio signal level of a G4S device, as reported by the panel."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _suffix = "Signal level"
+
+    def __init__(
+        self, coordinator: G4sDataUpdateCoordinator, serial_number: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "signal", serial_number)
+        self._attr_unique_id = f"{serial_number}_signal"
 
     @property
-    def extra_state_attributes(self) -> Dict[str, int]:
+    def native_value(self) -> int | None:
         """Return the state of the entity."""
-        battery_level = self.coordinator.data["climate"][
-            self.serial_number
-        ].battery_level
-        if not battery_level:
-            return {}
-        return {ATTR_BATTERY_LEVEL: battery_level}
+        return self._device.rf_level
+
+
+# Sensor entity of each snapshot category with device sensors
+DEVICE_SENSORS: dict[str, DeviceEntityFactory] = {
+    "climate": G4sThermometer,
+    "humidity": G4sHygrometer,
+    "battery": G4sBatterySensor,
+    "signal": G4sSignalSensor,
+}
+
+
+class G4sMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor exposing a coordinator metric."""
+
+    coordinator: G4sDataUpdateCoordinator
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: G4sDataUpdateCoordinator, key: str) -> None:
+        """Initialize the sensor."""
+        # No context, metrics change on every poll
+        super().__init__(coordinator)
+        giid = coordinator.entry.data[CONF_GIID]
+        name, unit, state_class, self._value = METRIC_SENSORS[key]
+        self._attr_name = f"G4S {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_unique_id = f"{giid}_{key}"
+        self._attr_device_info = {"identifiers": {(DOMAIN, giid)}}
+        self._key = key
+
+    async def async_added_to_hass(self) -> None:
+        """Start the loop probe for its metrics, until the sensor is removed."""
+        await super().async_added_to_hass()
+        if self._key in PROBE_METRICS:
+            self.async_on_remove(self.coordinator.probe.async_register())
 
     @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return (
-            super().available
-            and self.serial_number in self.coordinator.data["climate"]
-            and self.coordinator.data["climate"][self.serial_number].temperature_level
-            is not None
-        )
+    def native_value(self) -> float | int | None:
+        """Return the state of the entity."""
+        return self._value(self.coordinator)
@@ -0,0 +1,226 @@
+"""Shared G4S account sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import G4sApiClient
+from .budget import async_get_budget
+from .const import (
+    DATA_SESSIONS,
+    DOMAIN,
+    MAX_CONCURRENT_POLLS,
+    POLL_REQUESTS,
+    SESSION_STATUS_TTL,
+    SESSION_TTL,
+)
+
+if TYPE_CHECKING:
+    from g4s import Alarm
+
+    from .coordinator import G4sDataUpdateCoordinator
+
+
+class G4sSession:
+    """A logged in G4S account shared by the config flow and the coordinator.
+
+    The G4S API sends the credentials with every request, so logging in means
+    fetching the status. A login stays valid for ``SESSION_TTL`` and the status
+    it fetched can be used once by the next refresh.
+
+    The session also polls every installation of the account in one go, so the
+    first coordinator that asks for data refreshes all of them.
+
+    Sessions are shared through ``hass.data`` once their login succeeded or a
+    config entry uses them, and dropped when the last config entry unloads.
+    """
+
+    # pylint: disable=too-many-instance-attributes,import-outside-toplevel
+
+    def __init__(self, hass: HomeAssistant, email: str, password: str) -> None:
+        """Initialize the session."""
+        from g4s import Alarm
+
+        self.hass = hass
+        self.email = email
+        self.password = password
+        self.alarm = Alarm(username=email, password=password)
+        self.client = G4sApiClient(async_get_clientsession(hass), self.alarm)
+        self.expires = 0.0
+        self._status_time: float | None = None
+        self._login_task: asyncio.Task[None] | None = None
+        self._clients: dict[str, G4sApiClient] = {}
+        self._coordinators: dict[str, G4sDataUpdateCoordinator] = {}
+        self._poll_task: asyncio.Task[dict] | None = None
+        self._poll_requesters: set[G4sDataUpdateCoordinator] = set()
+        self._poll_limit = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self.coalesced_polls = 0
+
+    @property
+    def valid(self) -> bool:
+        """Return True if the credentials were accepted recently."""
+        return time.monotonic() < self.expires
+
+    async def async_login(self) -> None:
+        """Log in unless still logged in, sharing a login already in flight."""
+        if self.valid:
+            return
+        if self._login_task is None:
+            # Not started eagerly, see G4sDataUpdateCoordinator.async_fetch
+            self._login_task = self.hass.async_create_task(
+                self._async_login(), f"{DOMAIN} login", eager_start=False
+            )
+        await asyncio.shield(self._login_task)
+
+    async def _async_login(self) -> None:
+        try:
+            # Someone is waiting on the login, so it goes ahead of the polls
+            await async_get_budget(self.hass, self.email).async_acquire(
+                POLL_REQUESTS, command=True
+            )
+            await self.client.async_update_status()
+        finally:
+            self._login_task = None
+        self._status_time = time.monotonic()
+        self.async_renew()
+        sessions = _async_sessions(self.hass)
+        stored = sessions.get(self.email)
+        if stored is None or stored.password != self.password:
+            sessions[self.email] = self
+
+    @callback
+    def async_renew(self) -> None:
+        """Extend the login after a successful request."""
+        self.expires = time.monotonic() + SESSION_TTL.total_seconds()
+
+    @property
+    def in_use(self) -> bool:
+        """Return True if a config entry polls through the session."""
+        return bool(self._coordinators)
+
+    @callback
+    def async_take_login_status(self, alarm: Alarm) -> bool:
+        """Return True once if a login fetched the status of ``alarm`` recently."""
+        if alarm is not self.alarm:
+            return False
+        status_time, self._status_time = self._status_time, None
+        return (
+            status_time is not None
+            and time.monotonic() - status_time < SESSION_STATUS_TTL.total_seconds()
+        )
+
+    @callback
+    def async_get_client(self, giid: str) -> G4sApiClient:
+        """Return the client of an installation of the account."""
+        if (client := self._clients.get(giid)) is None:
+            if self.alarm.api.panel_id in (None, int(giid)):
+                client = self.client
+            else:
+                from g4s import Alarm
+
+                alarm = Alarm(username=self.alarm.username, password=self.password)
+                client = G4sApiClient(async_get_clientsession(self.hass), alarm)
+            client.alarm.api.panel_id = int(giid)
+            self._clients[giid] = client
+        return client
+
+    @callback
+    def async_register(
+        self, giid: str, coordinator: G4sDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Include an installation in the account poll."""
+        self._coordinators[giid] = coordinator
+        sessions = _async_sessions(self.hass)
+        stored = sessions.get(self.email)
+        if stored is None or not stored.in_use:
+            sessions[self.email] = self
+
+        @callback
+        def _async_unregister() -> None:
+            if self._coordinators.get(giid) is coordinator:
+                del self._coordinators[giid]
+            # The session holds the password, keep it only while it is used
+            if not self._coordinators and sessions.get(self.email) is self:
+                del sessions[self.email]
+
+        return _async_unregister
+
+    async def async_poll(self, requester: G4sDataUpdateCoordinator) -> None:
+        """Poll all installations, sharing a poll already in flight.
+
+        The installations that did not ask for the poll get the result pushed.
+        """
+        self._poll_requesters.add(requester)
+        if self._poll_task is not None:
+            self.coalesced_polls += 1
+        else:
+            # Not started eagerly, see G4sDataUpdateCoordinator.async_fetch
+            self._poll_task = self.hass.async_create_task(
+                self._async_poll(), f"{DOMAIN} account poll", eager_start=False
+            )
+        results = await asyncio.shield(self._poll_task)
+        if requester not in results:
+            # Not registered when the poll started
+            await requester.async_fetch()
+        elif (error := results[requester]) is not None:
+            raise error
+
+    async def _async_poll(self) -> dict[G4sDataUpdateCoordinator, BaseException | None]:
+        async def _async_fetch(coordinator: G4sDataUpdateCoordinator) -> None:
+            async with self._poll_limit:
+                await coordinator.async_fetch()
+
+        coordinators = list(self._coordinators.values())
+        try:
+            results = await asyncio.gather(
+                *(_async_fetch(coordinator) for coordinator in coordinators),
+                return_exceptions=True,
+            )
+        finally:
+            self._poll_task = None
+        requesters, self._poll_requesters = self._poll_requesters, set()
+
+        errors: dict[G4sDataUpdateCoordinator, BaseException | None] = {}
+        for coordinator, result in zip(coordinators, results):
+            error = result if isinstance(result, BaseException) else None
+            if coordinator in requesters:
+                errors[coordinator] = error
+            else:
+                coordinator.async_publish(error)
+        return errors
+
+
+async def async_import_library(hass: HomeAssistant) -> None:
+    """Import the g4s library in the executor before the first session is made.
+
+    It pulls in requests, so it is only imported once an account is used.
+    """
+    if "g4s" not in sys.modules:
+        await hass.async_add_import_executor_job(importlib.import_module, "g4s")
+
+
+@callback
+def _async_sessions(hass: HomeAssistant) -> dict[str, G4sSession]:
+    """Return the shared sessions by email."""
+    return hass.data.setdefault(DATA_SESSIONS, {})
+
+
+@callback
+def async_get_session(hass: HomeAssistant, email: str, password: str) -> G4sSession:
+    """Return the session of an account, or a new one if the password differs.
+
+    A new session only replaces the shared one once its login succeeds, so a
+    wrong password in a config flow does not break the running entries.
+    ``async_import_library`` must have been awaited first.
+    """
+    session = _async_sessions(hass).get(email)
+    if session is None or session.password != password:
+        session = G4sSession(hass, email, password)
+    return session
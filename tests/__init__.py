@@ -0,0 +1 @@
+"""Tests for the G4S integration."""
@@ -0,0 +1 @@
+"""Benchmarks of the G4S integration, run with ``pytest -m perf``."""
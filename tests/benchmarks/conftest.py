@@ -0,0 +1,25 @@
+"""Fixtures for the G4S benchmarks."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+
+@pytest.fixture
+def always_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let every refresh fetch from the cloud instead of reusing the status."""
+    monkeypatch.setattr(
+        "custom_components.g4s_alarm.coordinator.REFRESH_FRESHNESS", timedelta(0)
+    )
+
+
+@pytest.fixture
+def unlimited_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let every request through the budget right away.
+
+    The budget paces the requests to G4S, so with it the benchmarks measure
+    the pacing instead of the integration.
+    """
+    monkeypatch.setattr("custom_components.g4s_alarm.budget.BUDGET_CAPACITY", 10**9)
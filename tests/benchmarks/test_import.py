@@ -0,0 +1,43 @@
+"""Benchmark of the import of the integration, with ``python -X importtime``."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytestmark = pytest.mark.perf
+
+PACKAGE = "custom_components.g4s_alarm"
+
+
+def _import_times() -> dict[str, tuple[int, int]]:
+    """Return the self and cumulative microseconds of each imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_import_time(perf_report: dict[str, Any]) -> None:
+    """The integration imports without the g4s library."""
+    times = _import_times()
+
+    assert PACKAGE in times
+    assert not [module for module in times if module.split(".")[0] == "g4s"]
+    perf_report["cumulative_ms"] = round(times[PACKAGE][1] / 1000, 1)
+    perf_report["modules"] = len(times)
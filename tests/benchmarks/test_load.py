@@ -0,0 +1,146 @@
+"""Load test of many config entries on one Home Assistant instance.
+
+Each config entry polls its own installation of the fake cloud. The report of
+each entry count can be compared across releases to find the entries-per-node
+ceiling. Change the constants below to try other loads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.g4s_alarm.const import CONF_GIID, DOMAIN
+from custom_components.g4s_alarm.coordinator import G4sDataUpdateCoordinator
+from custom_components.g4s_alarm.metrics import G4sHistogram
+from custom_components.g4s_alarm.probe import async_get_loop_probe
+
+from ..fake_g4s import PASSWORD, FakeG4sNode
+
+pytestmark = pytest.mark.perf
+
+# Sensors of each installation and seconds the cloud takes to answer
+SENSORS = 50
+LATENCY = 0.05
+# Seconds between the polls of each entry, and how long the entries poll
+POLL_INTERVAL = 1
+DURATION = 5.0
+# How often the loop probe measures during the test
+PROBE_INTERVAL = timedelta(milliseconds=100)
+
+
+@pytest.fixture
+def fast_polls(
+    monkeypatch: pytest.MonkeyPatch, always_fetch: None, unlimited_budget: None
+) -> None:
+    """Poll every ``POLL_INTERVAL`` and probe every ``PROBE_INTERVAL``.
+
+    Polls this fast exceed the request budget of an account.
+    """
+    monkeypatch.setattr(
+        "custom_components.g4s_alarm.coordinator.MIN_ALLOWED_SCAN_INTERVAL",
+        timedelta(seconds=POLL_INTERVAL),
+    )
+    monkeypatch.setattr(
+        "custom_components.g4s_alarm.probe.LOOP_PROBE_INTERVAL", PROBE_INTERVAL
+    )
+
+
+def _summary(histograms: list[G4sHistogram]) -> dict[str, float | None]:
+    """Return the mean and max seconds of histograms taken together."""
+    count = sum(histogram.count for histogram in histograms)
+    if not count:
+        return {"mean": None, "max": None}
+    return {
+        "mean": round(sum(histogram.total for histogram in histograms) / count, 4),
+        "max": round(max(histogram.max for histogram in histograms), 4),
+    }
+
+
+@pytest.mark.parametrize("entries", [1, 10, 50])
+async def test_load(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    fast_polls: None,
+    perf_report: dict[str, Any],
+    entries: int,
+) -> None:
+    """Loop lag, executor wait, memory per entry and poll jitter of N entries."""
+    # One more installation, whose entry loads the integration before measuring
+    node = FakeG4sNode(entries + 1, SENSORS, LATENCY)
+    node.register(aioclient_mock)
+    config_entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Site {number}",
+            unique_id=str(panel_id),
+            data={
+                CONF_EMAIL: f"site{number}@example.com",
+                CONF_PASSWORD: PASSWORD,
+                CONF_GIID: str(panel_id),
+            },
+            options={CONF_SCAN_INTERVAL: POLL_INTERVAL},
+        )
+        for number, panel_id in enumerate(node.clouds)
+    ]
+    config_entries[0].add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    tracemalloc.start()
+    try:
+        for entry in config_entries[1:]:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    coordinators: list[G4sDataUpdateCoordinator] = list(hass.data[DOMAIN].values())
+    # Measure the polls only, not the setup
+    for coordinator in coordinators:
+        coordinator.metrics.poll_jitter = G4sHistogram()
+    fetches = sum(coordinator.metrics.fetch.count for coordinator in coordinators)
+    # The probe only runs on request, as its sensors are disabled by default
+    probe = async_get_loop_probe(hass)
+    stop_probe = probe.async_register()
+    try:
+        await asyncio.sleep(DURATION)
+    finally:
+        stop_probe()
+
+    polls = (
+        sum(coordinator.metrics.fetch.count for coordinator in coordinators) - fetches
+    )
+    perf_report.update(
+        entries=len(coordinators),
+        sensors_per_entry=SENSORS,
+        latency=LATENCY,
+        poll_interval=POLL_INTERVAL,
+        memory_per_entry_kib=round(memory / entries / 1024, 1),
+        polls_per_second=round(polls / DURATION, 1),
+        loop_lag=_summary([probe.loop_lag]),
+        executor_wait=_summary([probe.executor_wait]),
+        fallback_pending_max=max(
+            coordinator.metrics.fallback_pending_max for coordinator in coordinators
+        ),
+        poll_jitter=_summary(
+            [coordinator.metrics.poll_jitter for coordinator in coordinators]
+        ),
+        budget_throttled=coordinators[0].budget.throttled,
+    )
+    assert probe.loop_lag.count
+    # Every entry kept polling on its own schedule
+    assert all(coordinator.metrics.poll_jitter.count for coordinator in coordinators)
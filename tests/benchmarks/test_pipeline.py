@@ -0,0 +1,134 @@
+"""Benchmarks of the whole pipeline, from the fake cloud to the state machine."""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import DOMAIN
+from custom_components.g4s_alarm.coordinator import G4sDataUpdateCoordinator
+
+from ..fake_g4s import FakeG4sCloud
+
+pytestmark = pytest.mark.perf
+
+SENSORS = 500
+# Polls of the throughput test, and the share of door sensors toggled per poll
+POLLS = 20
+CHANGED = 0.01
+# Arm and disarm cycles of the command latency test
+COMMANDS = 5
+
+
+async def _async_setup(
+    hass: HomeAssistant, cloud: FakeG4sCloud, entry: MockConfigEntry
+) -> G4sDataUpdateCoordinator:
+    cloud.populate(SENSORS, users=10, chips=10)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_poll_throughput(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    always_fetch: None,
+    unlimited_budget: None,
+    perf_report: dict[str, Any],
+) -> None:
+    """Polls per second and state writes per poll with a few changes each."""
+    coordinator = await _async_setup(hass, cloud, config_entry)
+    writes: list[Event] = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+    suppressed = coordinator.suppressed_writes
+    doors = [device for device in cloud.devices if device["isOpen"] is not None]
+    changed = max(1, int(len(doors) * CHANGED))
+
+    start = time.perf_counter()
+    for poll in range(POLLS):
+        for device in doors[poll * changed : (poll + 1) * changed]:
+            device["isOpen"] = not device["isOpen"]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+
+    perf_report["sensors"] = SENSORS
+    perf_report["polls_per_second"] = round(POLLS / elapsed, 1)
+    perf_report["state_writes_per_poll"] = len(writes) / POLLS
+    perf_report["suppressed_writes_per_poll"] = (
+        coordinator.suppressed_writes - suppressed
+    ) / POLLS
+    perf_report["budget_throttled"] = coordinator.budget.throttled
+    # Door sensors write their state, the diagnostic sensors the fetch latency
+    assert len(writes) < POLLS * (changed + 10)
+
+
+async def test_memory_per_sensor(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    perf_report: dict[str, Any],
+) -> None:
+    """Memory held after setup, per sensor of the installation."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        await _async_setup(hass, cloud, config_entry)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    perf_report["sensors"] = SENSORS
+    perf_report["entities"] = len(hass.states.async_all())
+    perf_report["bytes_per_sensor"] = held // SENSORS
+
+
+async def test_command_latency(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    unlimited_budget: None,
+    perf_report: dict[str, Any],
+) -> None:
+    """Time from the service call to the confirmed state."""
+    await _async_setup(hass, cloud, config_entry)
+    latencies = []
+    for _ in range(COMMANDS):
+        for service, data in (
+            ("alarm_arm_away", {}),
+            ("alarm_disarm", {"code": "1001"}),
+        ):
+            start = time.perf_counter()
+            await hass.services.async_call(
+                "alarm_control_panel",
+                service,
+                {"entity_id": "alarm_control_panel.g4s_alarm", **data},
+                blocking=True,
+            )
+            latencies.append(time.perf_counter() - start)
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "disarmed"
+    perf_report["commands"] = len(latencies)
+    perf_report["mean_ms"] = round(sum(latencies) / len(latencies) * 1000, 2)
+    perf_report["max_ms"] = round(max(latencies) * 1000, 2)
+    perf_report["budget_throttled"] = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].budget.throttled
+
+
+async def test_poll_processing(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Event loop time of publishing an unchanged poll to the entities."""
+    coordinator = await _async_setup(hass, cloud, config_entry)
+    benchmark(coordinator.async_publish)
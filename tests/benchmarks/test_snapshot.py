@@ -0,0 +1,147 @@
+"""Benchmarks of the snapshot against the dicts rebuilt by earlier versions.
+
+Earlier versions scanned the sensors once per category on every poll, and the
+entities looked their device up in those dicts for every property.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from g4s import Alarm
+from homeassistant.core import HomeAssistant
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import DEVICE_TYPE_NAME, DOMAIN
+from custom_components.g4s_alarm.coordinator import G4sDataUpdateCoordinator
+from custom_components.g4s_alarm.models import G4sSnapshot
+from custom_components.g4s_alarm.sensor import G4sThermometer
+
+from ..fake_g4s import PANEL_ID, FakeG4sCloud
+
+pytestmark = pytest.mark.perf
+
+SENSORS = 500
+
+
+def _legacy_transform(alarm: Alarm) -> dict[str, Any]:
+    """Return the data of a poll the way the coordinator used to build it."""
+    # pylint: disable-next=import-outside-toplevel
+    from g4s.utils.enums import DeviceType
+
+    return {
+        "alarm": alarm.state.name,
+        "climate": {
+            device.name: device
+            for device in alarm.sensors
+            if device.temperature_level is not None
+        },
+        "door_window": {
+            device.name: device
+            for device in alarm.sensors
+            if device.type == DeviceType.DOORWINDOWSENSOR
+        },
+        "panel": {
+            device.name: device
+            for device in alarm.sensors
+            if device.type == DeviceType.PANEL
+        },
+    }
+
+
+class _LegacyThermometer:
+    """The properties the thermometer used to compute on every state write."""
+
+    def __init__(self, data: dict[str, Any], serial_number: str) -> None:
+        self.data = data
+        self.serial_number = serial_number
+
+    @property
+    def name(self) -> str:
+        """Return the name of the entity."""
+        name = self.data["climate"][self.serial_number].name
+        return f"{name} Temperature"
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information about this entity."""
+        device_type = self.data["climate"][self.serial_number].type.name
+        area = self.data["climate"][self.serial_number].name
+        return {
+            "name": area,
+            "suggested_area": area,
+            "manufacturer": "G4S",
+            "model": DEVICE_TYPE_NAME.get(device_type, device_type),
+            "identifiers": {(DOMAIN, self.serial_number)},
+            "via_device": (DOMAIN, "1234"),
+        }
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the state of the entity."""
+        return self.data["climate"][self.serial_number].temperature_level
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return (
+            self.serial_number in self.data["climate"]
+            and self.data["climate"][self.serial_number].temperature_level is not None
+        )
+
+
+def _write_states(entities: list[Any]) -> None:
+    """Read what a state write reads from every entity."""
+    for entity in entities:
+        (entity.name, entity.device_info, entity.native_value, entity.available)
+
+
+@pytest.fixture
+def alarm() -> Alarm:
+    """Return an alarm polled from an installation with many sensors."""
+    cloud = FakeG4sCloud()
+    cloud.populate(SENSORS)
+    return cloud.alarm()
+
+
+def test_poll_legacy(benchmark: BenchmarkFixture, alarm: Alarm) -> None:
+    """Three scans of the sensors per poll, as earlier versions did."""
+    benchmark.group = "poll"
+    benchmark(_legacy_transform, alarm)
+
+
+def test_poll_snapshot(benchmark: BenchmarkFixture, alarm: Alarm) -> None:
+    """One pass updating the snapshot in place."""
+    benchmark.group = "poll"
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(alarm)
+    benchmark(snapshot.update, alarm)
+
+
+def test_state_write_legacy(benchmark: BenchmarkFixture, alarm: Alarm) -> None:
+    """Nested lookups by every property of every thermometer."""
+    benchmark.group = "state write"
+    data = _legacy_transform(alarm)
+    benchmark(
+        _write_states, [_LegacyThermometer(data, name) for name in data["climate"]]
+    )
+
+
+async def test_state_write_snapshot(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Static attributes and a direct reference to the record."""
+    benchmark.group = "state write"
+    cloud.populate(SENSORS)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    benchmark(
+        _write_states,
+        [G4sThermometer(coordinator, key) for key in coordinator.data.climate],
+    )
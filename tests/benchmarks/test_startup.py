@@ -0,0 +1,92 @@
+"""Benchmarks of the setup of a config entry."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import DOMAIN, STORAGE_VERSION
+from custom_components.g4s_alarm.models import G4sSnapshot
+
+from ..fake_g4s import PANEL_ID, FakeG4sCloud
+
+pytestmark = pytest.mark.perf
+
+SENSORS = 200
+# Sensors of the large installation timed without latency
+LARGE_SENSORS = 600
+# Seconds the slow cloud takes to answer each request
+SLOW_LATENCY = 1.0
+
+
+async def _async_time_setup(hass: HomeAssistant, entry: MockConfigEntry) -> float:
+    """Return the seconds until the setup of the entry returns."""
+    start = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    elapsed = time.perf_counter() - start
+    # Let the refresh started in the background finish
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return elapsed
+
+
+async def test_cold_start_slow_cloud(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    perf_report: dict[str, Any],
+) -> None:
+    """Without a stored snapshot the setup waits for the cloud."""
+    cloud.populate(SENSORS)
+    cloud.latency = SLOW_LATENCY
+    perf_report["latency"] = SLOW_LATENCY
+    perf_report["setup_seconds"] = round(await _async_time_setup(hass, config_entry), 3)
+    assert hass.states.get("binary_sensor.sensor_1").state == "off"
+
+
+async def test_warm_start_slow_cloud(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    hass_storage: dict[str, Any],
+    perf_report: dict[str, Any],
+) -> None:
+    """With a stored snapshot the entities exist before the cloud answers."""
+    cloud.populate(SENSORS)
+    cloud.latency = SLOW_LATENCY
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": snapshot.as_dict(),
+    }
+    perf_report["latency"] = SLOW_LATENCY
+    perf_report["setup_seconds"] = round(await _async_time_setup(hass, config_entry), 3)
+    assert hass.states.get("binary_sensor.sensor_1").state == "off"
+
+
+async def test_setup_large_installation(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    perf_report: dict[str, Any],
+) -> None:
+    """Time the setup of several hundred devices, without cloud latency."""
+    cloud.populate(LARGE_SENSORS)
+    perf_report["sensors"] = LARGE_SENSORS
+    perf_report["setup_seconds"] = round(await _async_time_setup(hass, config_entry), 3)
+    devices = dr.async_entries_for_config_entry(device_registry, config_entry.entry_id)
+    entities = er.async_entries_for_config_entry(entity_registry, config_entry.entry_id)
+    perf_report["devices"] = len(devices)
+    perf_report["entities"] = len(entities)
+    perf_report["states"] = len(hass.states.async_all())
+    # The sensors and the hub
+    assert len(devices) == LARGE_SENSORS + 1
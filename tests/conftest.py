@@ -0,0 +1,98 @@
+"""Fixtures for the G4S tests."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.g4s_alarm.const import CONF_GIID, DOMAIN
+
+from .fake_g4s import EMAIL, PANEL_ID, PASSWORD, FakeG4sCloud
+
+# Measurements of the performance tests, by test and name
+PERF_REPORT: dict[str, dict[str, Any]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to save the performance report."""
+    parser.addoption(
+        "--g4s-report",
+        metavar="PATH",
+        help="write the measurements of the perf tests to a JSON file",
+    )
+
+
+def pytest_terminal_summary(
+    terminalreporter: Any, exitstatus: int, config: pytest.Config
+) -> None:
+    """Show the measurements of the performance tests and save them."""
+    if not PERF_REPORT:
+        return
+    terminalreporter.section("G4S performance")
+    for test, values in PERF_REPORT.items():
+        terminalreporter.write_line(test)
+        for name, value in values.items():
+            terminalreporter.write_line(f"    {name}: {value}")
+    if path := config.getoption("--g4s-report"):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(PERF_REPORT, file, indent=2)
+
+
+@pytest.fixture
+def perf_report(request: pytest.FixtureRequest) -> dict[str, Any]:
+    """Return the measurements of a performance test, shown after the run."""
+    return PERF_REPORT.setdefault(request.node.name, {})
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    enable_custom_integrations: None,
+) -> Generator[None]:
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def config_dir(hass: HomeAssistant, tmp_path) -> None:
+    """Keep the history files of each test apart."""
+    hass.config.config_dir = str(tmp_path)
+
+
+@pytest.fixture
+def cloud(aioclient_mock: AiohttpClientMocker) -> FakeG4sCloud:
+    """Return the fake G4S cloud the integration talks to."""
+    fake = FakeG4sCloud()
+    fake.register(aioclient_mock)
+    return fake
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry of the fake installation."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Home",
+        unique_id=str(PANEL_ID),
+        data={CONF_EMAIL: EMAIL, CONF_PASSWORD: PASSWORD, CONF_GIID: str(PANEL_ID)},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, cloud: FakeG4sCloud, config_entry: MockConfigEntry
+) -> MockConfigEntry:
+    """Set up the integration against the fake cloud."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
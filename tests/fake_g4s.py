@@ -0,0 +1,369 @@
+"""Fake G4S cloud answering the requests of the integration."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from http import HTTPStatus
+from typing import Any
+
+from g4s import Alarm
+from g4s.utils.alarm_status import AlarmStatus
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.g4s_alarm.api import (
+    BASE_URL,
+    COMMAND_PATH,
+    EVENTS_PATH,
+    STATUS_PATH,
+)
+
+EMAIL = "test@example.com"
+PASSWORD = "secret"
+PANEL_ID = 1234
+ARM_TIME = "2024-01-01T10:00:00"
+
+# Arm type of each state, see ``g4s.utils.enums.ArmType``
+ARM_TYPES = {"FULL_ARM": 0, "NIGHT_ARM": 1, "DISARMED": 3}
+# ``Type`` of each ``g4s.utils.enums.DeviceType`` used by the tests
+DEVICE_TYPES = {
+    "HUB": 1,
+    "DOORWINDOWSENSOR": 2,
+    "PANEL": 14,
+    "SMOKEALARM": 16,
+    "SIREN": 24,
+    "CAMERA": 38,
+    "ACCESSCHIP": 201,
+}
+
+
+def make_device(
+    device_id: int,
+    name: str,
+    device_type: str = "DOORWINDOWSENSOR",
+    **values: Any,
+) -> dict[str, Any]:
+    """Return a state device as the cloud sends it.
+
+    ``values`` override the camel case fields, e.g. ``isOpen`` or
+    ``temperatureLevel``.
+    """
+    device = {
+        "key": device_id,
+        "isTampered": None,
+        "hasLowBattery": None,
+        "hasSupervisionFault": None,
+        "isOpen": None,
+        "isLocked": False,
+        "isLockout": None,
+        "isTriggeredAlarm": False,
+        "alarmType": 0,
+        "userName": None,
+        "serialNumber": f"SN{device_id:05d}",
+        "dayPartition": False,
+        "nightPartition": False,
+        "rfLevel": None,
+        "batteryLevel": None,
+        "temperatureLevel": None,
+        "subType": None,
+        "attributes": {},
+        "hardwareDeviceType": None,
+        "roleGroupId": 0,
+        "bypassState": 0,
+        "lockChangedByUser": None,
+        "lockChangedByDeviceNumber": None,
+        "lockChangedByDeviceType": None,
+        "associatedOutputType": None,
+        "associatedOutputId": None,
+        "owner": None,
+        "panelUpdateTime": None,
+        "updateTime": None,
+        "chime": False,
+        "securityMode": None,
+        "isOutdoorMode": None,
+        "isBeepEnable": None,
+        "fullExitBeepsEnabled": None,
+        "doorBellEnabled": None,
+        "subDeviceType": None,
+        "panelDeviceId": None,
+        "isNormallyOpen": None,
+        "isPulseDevice": None,
+        "utDeviceType": None,
+        "additionalData": None,
+        "addedOrResetTime": None,
+        "PkId": 100000 + device_id,
+        "Id": device_id,
+        "Type": DEVICE_TYPES[device_type],
+        "Name": name,
+        "ParentDeviceId": None,
+        "PanelId": PANEL_ID,
+    }
+    device.update(values)
+    return device
+
+
+def make_user(user_id: int, name: str, access_code: str | None) -> dict[str, Any]:
+    """Return a user as the cloud sends it."""
+    return {
+        "id": user_id,
+        "name": name,
+        "roleId": 1,
+        "email": f"{name.lower()}@example.com",
+        "phoneNumber": "",
+        "languageCode": 1,
+        "canViewComfortVideo": False,
+        "userReadTermsAndConditions": True,
+        "eulaLastUpdatedTime": None,
+        "userNotificationsSettings": {},
+        "userStorages": {},
+        "passwordExpirationDays": 0,
+        "canAccessSmokeCannon": False,
+        "accessCode": access_code,
+        "emailConfirmationStatus": 1,
+        "PackageOfferings": [],
+    }
+
+
+def _panel_state(arm_type: int) -> dict[str, Any]:
+    state = dict.fromkeys(
+        (
+            "ArmForcedState",
+            "ArmDelayedState",
+            "AlarmState",
+            "Partition",
+            "ReceptionLevel",
+            "PanelBatteryLevel",
+            "CommunicationLink",
+            "BackupChannelStatus",
+            "BackupChannelStatusDescription",
+            "SirensVolumeLevel",
+            "SirensDuration",
+            "SirensEntryExitDuration",
+            "FrtState",
+        ),
+        0,
+    )
+    state.update(
+        dict.fromkeys(
+            (
+                "AlarmStateTime",
+                "DeviceName",
+                "ReceptionLevelChangedTime",
+                "IsPanelOfflineChangedTime",
+                "IsZWaveEnabledChangedTime",
+                "IsMainPowerConnectedChangedTime",
+                "HasLowBatteryChangedTime",
+                "SirensVolumeLevelDurationChangedTime",
+                "IsInInstallationModeChangedTime",
+                "IsInSignalStrengthTestChangedTime",
+                "FrtStateChangedTime",
+            )
+        )
+    )
+    state.update(
+        dict.fromkeys(
+            (
+                "ExitDelayArmInProcess",
+                "EntryDelayArmInProcess",
+                "IsPanelOffline",
+                "IsZWaveEnabled",
+                "IsMainPowerConnected",
+                "IsSimCardReady",
+                "HasLowBattery",
+                "SetupMode",
+                "IsInInstallationMode",
+                "IsInSignalStrengthTest",
+                "IsSynchronized",
+            ),
+            False,
+        )
+    )
+    state.update(ArmType=arm_type, ArmTypeChangedTime=ARM_TIME, PanelId=PANEL_ID)
+    return state
+
+
+class FakeG4sCloud:
+    """State of a single installation served through ``aioclient_mock``.
+
+    Tests change ``devices``, ``state`` or ``users`` between polls. Setting
+    ``status`` or ``response`` makes the next requests fail with that HTTP
+    status or G4S response code, and ``latency`` delays every answer.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self) -> None:
+        """Initialize a disarmed installation with a door sensor."""
+        self.panel_id = PANEL_ID
+        self.name = "Home"
+        self.state = "DISARMED"
+        self.changed_by: int | None = 1
+        self.devices: list[dict[str, Any]] = [
+            make_device(1, "Front door", isOpen=False, temperatureLevel=21)
+        ]
+        self.users = [make_user(1, "Alice", "1234")]
+        self.status = HTTPStatus.OK
+        self.response = 0
+        self.latency = 0.0
+        # Arm state the cloud reports after a command, if the command is obeyed
+        self.obey_commands = True
+        self.requests: Counter[str] = Counter()
+        self.commands: list[tuple[str, int | None]] = []
+
+    def populate(self, sensors: int, users: int = 1, chips: int = 0) -> None:
+        """Replace the installation with generated devices, users and chips.
+
+        Four in five sensors are door/window sensors, the others smoke
+        detectors. All of them report temperature, battery and signal.
+        """
+        self.devices = [
+            make_device(
+                number,
+                f"Sensor {number}",
+                "SMOKEALARM" if number % 5 == 4 else "DOORWINDOWSENSOR",
+                isOpen=None if number % 5 == 4 else False,
+                temperatureLevel=20,
+                batteryLevel=90,
+                rfLevel=3,
+                isTampered=False,
+            )
+            for number in range(1, sensors + 1)
+        ]
+        self.devices.extend(
+            make_device(
+                sensors + number,
+                f"Tag {number}",
+                "ACCESSCHIP",
+                accessCode=f"9{number:04d}",
+            )
+            for number in range(1, chips + 1)
+        )
+        self.users = [
+            make_user(number, f"User {number}", f"{1000 + number}")
+            for number in range(1, users + 1)
+        ]
+
+    def register(self, aioclient_mock: AiohttpClientMocker) -> None:
+        """Answer the requests of the integration from this installation."""
+        for path in (STATUS_PATH, EVENTS_PATH, COMMAND_PATH):
+            aioclient_mock.post(f"{BASE_URL}/{path}", side_effect=self.async_answer)
+
+    def status_payload(self) -> dict[str, Any]:
+        """Return the answer to a state request."""
+        return {
+            "Response": 0,
+            "ResponseDescription": "",
+            "panelInfo": {"PanelId": self.panel_id, "Name": self.name},
+            "panelSettings": {
+                "TimeZone": {
+                    "CountryCode": "DK",
+                    "TimeZoneId": 1,
+                    "OlsonName": "Europe/Copenhagen",
+                    "IsEnabled": True,
+                    "Name": "Copenhagen",
+                },
+                "OffsetFromUtcInMinutes": 60,
+                "DefaultTemperatureDevice": {
+                    "Id": self.devices[0]["Id"] if self.devices else None
+                },
+                "InstalledModules": 0,
+                "PrimaryLink": 0,
+                "AvailableDelayTimes": [],
+                "TagAccessCodeMinLength": 4,
+                "TagAccessCodeMaxLength": 8,
+                "TagAccessCodeAvailableLengths": [4],
+                "GuardAccessCodeLength": 4,
+            },
+            "panelState": _panel_state(ARM_TYPES[self.state]),
+            "systemState": _panel_state(ARM_TYPES[self.state]),
+            "stateDevices": self.devices,
+            "users": self.users,
+        }
+
+    def alarm(self) -> Alarm:
+        """Return a ``g4s.Alarm`` updated from the installation."""
+        alarm = Alarm(username=EMAIL, password=PASSWORD)
+        alarm.status = AlarmStatus(self.status_payload(), alarm.api)
+        alarm.users = alarm.status.users
+        alarm.state = alarm.status.system_state.arm_type
+        alarm.sensors = alarm.status.state_devices
+        alarm.last_state_change = alarm.status.system_state.arm_type_changed_time
+        for user in alarm.users:
+            if user.id == self.changed_by:
+                alarm.last_state_change_by = user
+        return alarm
+
+    def events_payload(self) -> dict[str, Any]:
+        """Return the answer to an event history request."""
+        events = []
+        if self.changed_by is not None:
+            events.append(
+                {
+                    "Events": [
+                        {"Header": {"LocalTime": ARM_TIME}, "UserId": self.changed_by}
+                    ]
+                }
+            )
+        return {"Events": json.dumps(events)}
+
+    async def async_answer(
+        self, method: str, url: Any, data: dict[str, Any]
+    ) -> AiohttpClientMockResponse:
+        """Answer a request to the installation."""
+        path = str(url).removeprefix(f"{BASE_URL}/")
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.status != HTTPStatus.OK:
+            return AiohttpClientMockResponse(method, url, status=self.status)
+        if self.response:
+            payload = {"Response": self.response, "ResponseDescription": "Failed"}
+        elif path == STATUS_PATH:
+            payload = self.status_payload()
+        elif path == EVENTS_PATH:
+            payload = self.events_payload()
+        else:
+            self.commands.append((data["methodToInvoke"], data.get("partition")))
+            if self.obey_commands:
+                self.state = (
+                    "DISARMED"
+                    if data["methodToInvoke"] == "Disarm"
+                    else "NIGHT_ARM" if data.get("partition") == 2 else "FULL_ARM"
+                )
+            payload = {"Response": 0}
+        return AiohttpClientMockResponse(method, url, json=payload)
+
+
+class FakeG4sNode:
+    """Installations of separate accounts served through ``aioclient_mock``.
+
+    Each request is answered by the installation of its panel id, so one Home
+    Assistant instance can run a config entry for each of them.
+    """
+
+    def __init__(self, installations: int, sensors: int, latency: float) -> None:
+        """Initialize generated installations with consecutive panel ids."""
+        self.clouds: dict[int, FakeG4sCloud] = {}
+        for number in range(installations):
+            cloud = FakeG4sCloud()
+            cloud.panel_id = PANEL_ID + number
+            cloud.name = f"Site {number + 1}"
+            cloud.latency = latency
+            cloud.populate(sensors)
+            self.clouds[cloud.panel_id] = cloud
+
+    def register(self, aioclient_mock: AiohttpClientMocker) -> None:
+        """Answer the requests of the integration from the installations."""
+        for path in (STATUS_PATH, EVENTS_PATH, COMMAND_PATH):
+            aioclient_mock.post(f"{BASE_URL}/{path}", side_effect=self._async_answer)
+
+    async def _async_answer(
+        self, method: str, url: Any, data: dict[str, Any]
+    ) -> AiohttpClientMockResponse:
+        # The state request names the panel "panel_id", the others "panelId"
+        panel_id = data.get("panel_id", data.get("panelId"))
+        return await self.clouds[panel_id].async_answer(method, url, data)
@@ -0,0 +1,95 @@
+"""Tests for the request budgets of the G4S accounts."""
+
+from __future__ import annotations
+
+import asyncio
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.g4s_alarm.budget import G4sRequestBudget, async_get_budget
+from custom_components.g4s_alarm.const import (
+    BUDGET_CAPACITY,
+    BUDGET_COMMAND_RESERVE,
+    BUDGET_REFILL_INTERVAL,
+)
+
+
+async def test_one_budget_per_account(hass: HomeAssistant) -> None:
+    """The config entries of an account share its budget, of a fixed size."""
+    budget = async_get_budget(hass, "a@example.com")
+    assert async_get_budget(hass, "a@example.com") is budget
+    assert async_get_budget(hass, "b@example.com") is not budget
+    assert budget.capacity == BUDGET_CAPACITY
+
+
+async def test_burst_and_reserve(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Polls leave the command reserve, commands may use it."""
+    budget = G4sRequestBudget(hass)
+    for _ in range(BUDGET_CAPACITY - BUDGET_COMMAND_RESERVE):
+        await budget.async_acquire()
+    assert budget.remaining == BUDGET_COMMAND_RESERVE
+    assert budget.throttled == 0
+
+    poll = hass.async_create_task(budget.async_acquire())
+    await asyncio.sleep(0)
+    assert not poll.done()
+    assert budget.throttled == 1
+
+    for _ in range(BUDGET_COMMAND_RESERVE):
+        await budget.async_acquire(command=True)
+    assert budget.remaining == 0
+
+    freezer.tick(BUDGET_REFILL_INTERVAL * (BUDGET_COMMAND_RESERVE + 1))
+    async_fire_time_changed(hass)
+    await poll
+
+
+async def test_commands_go_first(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Waiting commands are let through before waiting polls."""
+    budget = G4sRequestBudget(hass)
+    await budget.async_acquire(BUDGET_CAPACITY, command=True)
+
+    order: list[str] = []
+
+    async def _acquire(name: str, command: bool) -> None:
+        await budget.async_acquire(command=command)
+        order.append(name)
+
+    poll = hass.async_create_task(_acquire("poll", False))
+    await asyncio.sleep(0)
+    command = hass.async_create_task(_acquire("command", True))
+    await asyncio.sleep(0)
+
+    freezer.tick(BUDGET_REFILL_INTERVAL)
+    async_fire_time_changed(hass)
+    await command
+    assert order == ["command"]
+
+    freezer.tick(BUDGET_REFILL_INTERVAL * (BUDGET_COMMAND_RESERVE + 1))
+    async_fire_time_changed(hass)
+    await poll
+    assert order == ["command", "poll"]
+
+
+async def test_cancelled_waiter_is_skipped(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A waiter cancelled while waiting does not use up requests."""
+    budget = G4sRequestBudget(hass)
+    await budget.async_acquire(BUDGET_CAPACITY, command=True)
+
+    cancelled = hass.async_create_task(budget.async_acquire(command=True))
+    waiting = hass.async_create_task(budget.async_acquire(command=True))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    freezer.tick(BUDGET_REFILL_INTERVAL)
+    async_fire_time_changed(hass)
+    await waiting
+    assert budget.remaining == 0
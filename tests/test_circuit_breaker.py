@@ -0,0 +1,70 @@
+"""Tests for the circuit breaker."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.g4s_alarm.circuit_breaker import (
+    CircuitState,
+    G4sCircuitBreaker,
+)
+from custom_components.g4s_alarm.const import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+)
+
+
+def test_opens_after_threshold(freezer: FrozenDateTimeFactory) -> None:
+    """The circuit opens after the threshold and half-opens after the delay."""
+    breaker = G4sCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        assert not breaker.failure()
+        assert breaker.allow()
+
+    assert breaker.failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+
+    freezer.tick(BACKOFF_BASE)
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_half_open_failure_backs_off(freezer: FrozenDateTimeFactory) -> None:
+    """A failed trial call opens the circuit for longer."""
+    breaker = G4sCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        breaker.failure()
+    freezer.tick(BACKOFF_BASE)
+    assert breaker.allow()
+
+    assert breaker.failure()
+    assert not breaker.allow()
+    # The delay doubled, so the base delay is not enough any more
+    freezer.tick(BACKOFF_BASE * 0.99)
+    assert not breaker.allow()
+    freezer.tick(BACKOFF_BASE * 1.01)
+    assert breaker.allow()
+
+
+def test_delay_is_capped(freezer: FrozenDateTimeFactory) -> None:
+    """The delay never exceeds the maximum backoff."""
+    breaker = G4sCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD + 40):
+        breaker.failure()
+    freezer.tick(BACKOFF_MAX + timedelta(seconds=1))
+    assert breaker.allow()
+
+
+def test_success_closes() -> None:
+    """A success closes the circuit and forgets the failures."""
+    breaker = G4sCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        breaker.failure()
+    breaker.success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
@@ -0,0 +1,34 @@
+"""Tests for the G4S config and options flows."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import CONF_CLIMATE_DEADBAND, DOMAIN
+
+from .fake_g4s import FakeG4sCloud
+
+
+async def test_options_apply_without_reload(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """Saved options retune the running coordinator."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    result = await hass.config_entries.options.async_init(init_integration.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SCAN_INTERVAL: 30, CONF_CLIMATE_DEADBAND: 0.5}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert init_integration.options[CONF_SCAN_INTERVAL] == 30
+    assert hass.data[DOMAIN][init_integration.entry_id] is coordinator
+    assert coordinator.update_interval == timedelta(seconds=30)
+    assert coordinator.climate_deadband == 0.5
@@ -0,0 +1,630 @@
+"""Tests for the G4S coordinator."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.g4s_alarm.api import STATUS_PATH
+from custom_components.g4s_alarm.circuit_breaker import CircuitState
+from custom_components.g4s_alarm.const import (
+    ACTIVITY_WINDOW,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CLIENT_RETRY_INTERVAL,
+    COMMAND_CONFIRM_FETCHES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_BACKOFF_FACTOR,
+    CONF_CLIMATE_DEADBAND,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_REMOVAL_POLLS,
+    DOMAIN,
+    MAX_STALE_AGE,
+    REFRESH_FRESHNESS,
+    STORAGE_VERSION,
+)
+from custom_components.g4s_alarm.coordinator import G4sDataUpdateCoordinator
+
+from .fake_g4s import PANEL_ID, FakeG4sCloud, make_device
+
+DOOR = "binary_sensor.front_door"
+TEMPERATURE = "sensor.front_door_temperature"
+
+
+async def _async_poll(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> G4sDataUpdateCoordinator:
+    """Poll once the last status is too old to be reused."""
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    freezer.tick(REFRESH_FRESHNESS)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    return coordinator
+
+
+async def test_changes_write_only_their_entities(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """A door opening does not write the temperature sensor."""
+    temperature = hass.states.get(TEMPERATURE)
+    cloud.devices[0]["isOpen"] = True
+
+    coordinator = await _async_poll(hass, init_integration, freezer)
+
+    assert hass.states.get(DOOR).state == "on"
+    assert hass.states.get(TEMPERATURE).last_updated == temperature.last_updated
+    assert coordinator.suppressed_writes > 0
+    assert [(event.key, event.name) for event in coordinator.history.events] == [
+        ("SN00001", "Front door")
+    ]
+
+
+async def test_deadband_holds_back_small_changes(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """Readings within the deadband are not written, and counted once."""
+    hass.config_entries.async_update_entry(
+        init_integration, options={CONF_CLIMATE_DEADBAND: 0.5}
+    )
+    await hass.async_block_till_done()
+    coordinator = await _async_poll(hass, init_integration, freezer)
+    # A poll without changes skips every listener
+    suppressed = coordinator.suppressed_writes
+    await _async_poll(hass, init_integration, freezer)
+    unchanged = coordinator.suppressed_writes - suppressed
+
+    cloud.devices[0]["temperatureLevel"] = 21.3
+    suppressed = coordinator.suppressed_writes
+    await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(TEMPERATURE).state == "21"
+    assert coordinator.suppressed_writes - suppressed == unchanged
+
+    cloud.devices[0]["temperatureLevel"] = 21.6
+    await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(TEMPERATURE).state == "21.6"
+
+
+async def test_adaptive_polling(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """Polls back off while quiet and speed up for a while after activity."""
+    hass.config_entries.async_update_entry(
+        init_integration,
+        options={
+            CONF_ADAPTIVE_POLLING: True,
+            CONF_MIN_SCAN_INTERVAL: 10,
+            CONF_MAX_SCAN_INTERVAL: 60,
+            CONF_BACKOFF_FACTOR: 2.0,
+        },
+    )
+    await hass.async_block_till_done()
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][init_integration.entry_id]
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    intervals = []
+    for _ in range(4):
+        await _async_poll(hass, init_integration, freezer)
+        intervals.append(coordinator.update_interval.total_seconds())
+    assert intervals == [20, 40, 60, 60]
+
+    cloud.devices[0]["isOpen"] = True
+    await _async_poll(hass, init_integration, freezer)
+    assert coordinator.update_interval == timedelta(seconds=10)
+    await _async_poll(hass, init_integration, freezer)
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    freezer.tick(ACTIVITY_WINDOW)
+    await _async_poll(hass, init_integration, freezer)
+    assert coordinator.update_interval == timedelta(seconds=20)
+
+
+async def test_failures_keep_stale_data(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """Failed polls keep the last data until it is too old."""
+    cloud.status = HTTPStatus.INTERNAL_SERVER_ERROR
+    coordinator = await _async_poll(hass, init_integration, freezer)
+
+    assert coordinator.stale
+    assert hass.states.get(DOOR).state == "off"
+    assert hass.states.get(DOOR).attributes["stale"]
+
+    freezer.tick(MAX_STALE_AGE)
+    await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(DOOR).state == STATE_UNAVAILABLE
+
+    cloud.status = HTTPStatus.OK
+    coordinator.breaker.success()
+    await _async_poll(hass, init_integration, freezer)
+    assert not coordinator.stale
+    assert hass.states.get(DOOR).state == "off"
+    assert "stale" not in hass.states.get(DOOR).attributes
+
+
+async def test_first_poll_is_staggered(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Only the first poll is delayed by a part of the interval."""
+    stagger = timedelta(seconds=20)
+    with patch(
+        "custom_components.g4s_alarm.coordinator.random.uniform",
+        return_value=stagger.total_seconds(),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    requests = cloud.requests[STATUS_PATH]
+
+    freezer.tick(DEFAULT_SCAN_INTERVAL + timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert cloud.requests[STATUS_PATH] == requests
+
+    freezer.tick(stagger)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert cloud.requests[STATUS_PATH] == requests + 1
+
+    freezer.tick(DEFAULT_SCAN_INTERVAL + timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert cloud.requests[STATUS_PATH] == requests + 2
+
+
+async def test_circuit_opens(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """The cloud is left alone after repeated failures."""
+    cloud.status = HTTPStatus.BAD_GATEWAY
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        coordinator = await _async_poll(hass, init_integration, freezer)
+    assert coordinator.breaker.state is CircuitState.OPEN
+
+    requests = cloud.requests[STATUS_PATH]
+    await _async_poll(hass, init_integration, freezer)
+    assert cloud.requests[STATUS_PATH] == requests
+    assert coordinator.stale
+
+
+async def test_rejected_credentials_start_reauth(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """A rejected password starts a reauth flow instead of going stale."""
+    cloud.status = HTTPStatus.UNAUTHORIZED
+    coordinator = await _async_poll(hass, init_integration, freezer)
+
+    assert not coordinator.last_update_success
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+
+
+async def test_failure_response_starts_reauth(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """G4S reports a changed password with HTTP 200 and a non-zero Response."""
+    cloud.response = 1
+    await _async_poll(hass, init_integration, freezer)
+
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+
+
+async def test_other_failure_response_is_transient(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """Other non-zero Responses go through the circuit breaker."""
+    cloud.response = 99
+    coordinator = await _async_poll(hass, init_integration, freezer)
+
+    assert not hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert coordinator.breaker.failures == 1
+    assert coordinator.stale
+
+
+async def test_library_failure_response_is_transient(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """The bare exception of the g4s library does not say what failed."""
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][init_integration.entry_id]
+    with (
+        patch.object(coordinator.client, "async_update_status", side_effect=ValueError),
+        patch.object(
+            coordinator.alarm,
+            "update_status",
+            side_effect=Exception("Wrong username or password"),
+        ),
+    ):
+        await _async_poll(hass, init_integration, freezer)
+
+    assert not hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert coordinator.breaker.failures == 1
+    assert coordinator.stale
+
+
+async def test_arm_is_confirmed(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """Arming sends the command and shows the state G4S confirms."""
+    await hass.services.async_call(
+        "alarm_control_panel",
+        "alarm_arm_away",
+        {"entity_id": "alarm_control_panel.g4s_alarm"},
+        blocking=True,
+    )
+    assert cloud.commands == [("Arm", 0)]
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "armed_away"
+    history = hass.data[DOMAIN][init_integration.entry_id].history
+    assert [(event.kind, event.state) for event in history.events] == [
+        ("alarm", "FULL_ARM")
+    ]
+
+
+async def test_change_without_user_event_has_no_user(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """The user of an earlier change is not given for a later one."""
+    for service in ("alarm_arm_away", "alarm_arm_night"):
+        await hass.services.async_call(
+            "alarm_control_panel",
+            service,
+            {"entity_id": "alarm_control_panel.g4s_alarm"},
+            blocking=True,
+        )
+        cloud.changed_by = None
+
+    history = hass.data[DOMAIN][init_integration.entry_id].history
+    assert [(event.state, event.user) for event in history.events] == [
+        ("FULL_ARM", "Alice"),
+        ("NIGHT_ARM", None),
+    ]
+
+
+async def test_unconfirmed_command_polls_a_few_times(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """An ignored command is confirmed with a limited number of polls."""
+    monkeypatch.setattr(
+        "custom_components.g4s_alarm.coordinator.COMMAND_CONFIRM_INTERVAL",
+        timedelta(0),
+    )
+    cloud.obey_commands = False
+    polls = cloud.requests[STATUS_PATH]
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            "alarm_control_panel",
+            "alarm_arm_away",
+            {"entity_id": "alarm_control_panel.g4s_alarm"},
+            blocking=True,
+        )
+    assert cloud.requests[STATUS_PATH] - polls == COMMAND_CONFIRM_FETCHES
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "disarmed"
+
+
+async def test_warm_start_from_stored_snapshot(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    hass_storage: dict,
+) -> None:
+    """The entities of the stored snapshot are created while G4S is down."""
+    cloud.status = HTTPStatus.SERVICE_UNAVAILABLE
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {
+            "alarm": "NIGHT_ARM",
+            "changed_by": "Alice",
+            "devices": [
+                {
+                    "key": "SN00001",
+                    "name": "Front door",
+                    "device_type": "DOORWINDOWSENSOR",
+                    "is_open": True,
+                }
+            ],
+        },
+    }
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "armed_night"
+    assert hass.states.get(DOOR).state == "on"
+    assert hass.states.get(DOOR).attributes["stale"]
+
+
+async def test_disarm_checks_the_code(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """A wrong code is refused without calling G4S."""
+    cloud.state = "FULL_ARM"
+    await hass.data[DOMAIN][init_integration.entry_id].async_refresh()
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            "alarm_control_panel",
+            "alarm_disarm",
+            {"entity_id": "alarm_control_panel.g4s_alarm", "code": "0000"},
+            blocking=True,
+        )
+    assert not cloud.commands
+
+    await hass.services.async_call(
+        "alarm_control_panel",
+        "alarm_disarm",
+        {"entity_id": "alarm_control_panel.g4s_alarm", "code": "1234"},
+        blocking=True,
+    )
+    assert cloud.commands == [("Disarm", None)]
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "disarmed"
+
+
+async def test_disarm_from_restored_snapshot(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    hass_storage: dict,
+) -> None:
+    """The code is checked against G4S before the first poll succeeded."""
+    cloud.status = HTTPStatus.SERVICE_UNAVAILABLE
+    cloud.state = "FULL_ARM"
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {"alarm": "FULL_ARM", "changed_by": "Alice", "devices": []},
+    }
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    cloud.status = HTTPStatus.OK
+    await hass.services.async_call(
+        "alarm_control_panel",
+        "alarm_disarm",
+        {"entity_id": "alarm_control_panel.g4s_alarm", "code": "1234"},
+        blocking=True,
+    )
+    assert cloud.commands == [("Disarm", None)]
+
+
+async def test_snapshot_keyed_by_name_is_not_restored(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    hass_storage: dict,
+) -> None:
+    """Devices stored by name are left to the first poll."""
+    cloud.status = HTTPStatus.SERVICE_UNAVAILABLE
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {
+            "alarm": "NIGHT_ARM",
+            "changed_by": "Alice",
+            "devices": [
+                {
+                    "key": "Front door",
+                    "name": "Front door",
+                    "device_type": "DOORWINDOWSENSOR",
+                    "is_open": True,
+                }
+            ],
+        },
+    }
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "armed_night"
+    assert hass.states.get(DOOR) is None
+
+    cloud.status = HTTPStatus.OK
+    await _async_poll(hass, config_entry, freezer)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(DOOR).state == "off"
+
+
+async def test_legacy_ids_are_migrated(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+) -> None:
+    """Entities and devices registered by device name move to the serial number."""
+    cloud.devices.append(make_device(2, "Front door", "SMOKEALARM", batteryLevel=80))
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={(DOMAIN, "Front door")},
+    )
+    door = entity_registry.async_get_or_create(
+        "binary_sensor",
+        DOMAIN,
+        "Front door_door_window",
+        config_entry=config_entry,
+        suggested_object_id="my_door",
+    )
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entity_registry.async_get(door.entity_id).unique_id == "SN00001_door_window"
+    assert hass.states.get(door.entity_id).state == "off"
+    assert device_registry.async_get(device.id).identifiers == {(DOMAIN, "SN00001")}
+    # The smoke detector of the same name gets its own device
+    smoke = entity_registry.async_get_entity_id(
+        "binary_sensor", DOMAIN, "SN00002_smoke"
+    )
+    assert hass.states.get(smoke).state == "off"
+    assert (
+        entity_registry.async_get(smoke).device_id
+        != entity_registry.async_get(door.entity_id).device_id
+    )
+
+
+async def test_ids_without_serial_number_are_migrated(
+    hass: HomeAssistant,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Entities of devices keyed by their id alone move to the giid key."""
+    cloud.devices[0]["serialNumber"] = None
+    door = entity_registry.async_get_or_create(
+        "binary_sensor",
+        DOMAIN,
+        "1_door_window",
+        config_entry=config_entry,
+        suggested_object_id="my_door",
+    )
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert (
+        entity_registry.async_get(door.entity_id).unique_id
+        == f"{PANEL_ID}_1_door_window"
+    )
+    assert hass.states.get(door.entity_id).state == "off"
+
+
+async def test_new_device_adds_entities(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """A device added to the installation gets its entities without a reload."""
+    cloud.devices.append(make_device(2, "Hallway", "SMOKEALARM", batteryLevel=80))
+    await _async_poll(hass, init_integration, freezer)
+
+    assert hass.states.get("binary_sensor.hallway_smoke").state == "off"
+    assert hass.states.get("sensor.hallway_battery").state == "80"
+
+
+async def test_renamed_device_is_updated_in_the_registry(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+    device_registry: dr.DeviceRegistry,
+) -> None:
+    """A device renamed in G4S gets the new name in the device registry."""
+    cloud.devices[0]["Name"] = "Back door"
+    await _async_poll(hass, init_integration, freezer)
+
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "SN00001")})
+    assert device.name == "Back door"
+    assert hass.states.get(DOOR).name == "Back door"
+
+
+async def test_client_failure_falls_back_for_a_while(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+) -> None:
+    """An unexpected client error uses the g4s library, then the client again."""
+    coordinator: G4sDataUpdateCoordinator = hass.data[DOMAIN][init_integration.entry_id]
+    requests = cloud.requests[STATUS_PATH]
+    with (
+        patch.object(
+            coordinator.client, "async_update_status", side_effect=ValueError
+        ) as client_update,
+        patch.object(coordinator.alarm, "update_status") as library_update,
+    ):
+        await _async_poll(hass, init_integration, freezer)
+        await _async_poll(hass, init_integration, freezer)
+    assert client_update.call_count == 1
+    assert library_update.call_count == 2
+    assert not coordinator.stale
+
+    freezer.tick(CLIENT_RETRY_INTERVAL)
+    await _async_poll(hass, init_integration, freezer)
+    assert cloud.requests[STATUS_PATH] == requests + 1
+
+
+async def test_missing_reading_makes_the_entity_unavailable(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """A null reading keeps the entity and its customisations."""
+    cloud.devices[0]["temperatureLevel"] = None
+    await _async_poll(hass, init_integration, freezer)
+
+    assert hass.states.get(TEMPERATURE).state == STATE_UNAVAILABLE
+    assert hass.data[DOMAIN][init_integration.entry_id].last_update_success
+    assert entity_registry.async_get(TEMPERATURE) is not None
+
+    cloud.devices[0]["temperatureLevel"] = 22
+    await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(TEMPERATURE).state == "22"
+
+
+async def test_missing_device_is_removed_after_several_polls(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    init_integration: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Entities of a device missing from the polls go unavailable, then away."""
+    cloud.devices.clear()
+    await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(DOOR).state == STATE_UNAVAILABLE
+    assert entity_registry.async_get(DOOR) is not None
+
+    for _ in range(DEVICE_REMOVAL_POLLS - 1):
+        await _async_poll(hass, init_integration, freezer)
+    assert hass.states.get(DOOR) is None
+    assert entity_registry.async_get(DOOR) is None
@@ -0,0 +1,21 @@
+"""Tests for the G4S diagnostics."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """The credentials are redacted, the written climate readings included."""
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+
+    assert diagnostics["entry"]["password"] == "**REDACTED**"
+    assert diagnostics["reported_climate"] == {"climate SN00001": 21}
+    assert diagnostics["node"]["entries"] == 1
@@ -0,0 +1,72 @@
+"""Tests for the event history."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.g4s_alarm.history import G4sEvent, G4sHistory
+
+# History size of the rewrite test, the default makes it slow
+HISTORY_SIZE = 10
+
+
+async def test_between(hass: HomeAssistant) -> None:
+    """Time ranges include both ends."""
+    history = G4sHistory(hass, "entry")
+    for second in range(10):
+        history.async_record(G4sEvent(float(second), "door_window", "a", True, None))
+
+    assert [event.time for event in history.between(3, 5)] == [3, 4, 5]
+    assert len(history.between()) == 10
+    assert [event.time for event in history.between(end=1)] == [0, 1]
+    assert history.between(20) == []
+
+
+async def test_time_order(hass: HomeAssistant) -> None:
+    """An event older than the last one is recorded at the time of the last."""
+    history = G4sHistory(hass, "entry")
+    history.async_record(G4sEvent(10.0, "alarm", None, "FULL_ARM", "Alice"))
+    history.async_record(G4sEvent(5.0, "alarm", None, "DISARMED", "Alice"))
+
+    assert [event.time for event in history.events] == [10, 10]
+
+
+async def test_persisted(hass: HomeAssistant) -> None:
+    """Events are stored and loaded again, skipping broken lines."""
+    history = G4sHistory(hass, "entry")
+    history.async_record(G4sEvent(1.0, "door_window", "a", True, None))
+    history.async_record(G4sEvent(2.0, "door_window", "a", False, None))
+    await hass.async_block_till_done()
+
+    with open(history.path, "a", encoding="utf-8") as file:
+        file.write('[3.0, "door_wi')
+
+    loaded = G4sHistory(hass, "entry")
+    await loaded.async_load()
+    assert list(loaded.events) == list(history.events)
+
+    await loaded.async_remove()
+    removed = G4sHistory(hass, "entry")
+    await removed.async_load()
+    assert not removed.events
+
+
+async def test_rewritten_when_full(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The file is rewritten with the buffer once it grows too long."""
+    monkeypatch.setattr(
+        "custom_components.g4s_alarm.history.HISTORY_SIZE", HISTORY_SIZE
+    )
+    history = G4sHistory(hass, "entry")
+    for second in range(2 * HISTORY_SIZE + 1):
+        history.async_record(G4sEvent(float(second), "door_window", "a", True, None))
+        await hass.async_block_till_done()
+
+    with open(history.path, encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert len(lines) <= 2 * HISTORY_SIZE
+    assert lines[-1][0] == 2 * HISTORY_SIZE
@@ -0,0 +1,142 @@
+"""Tests for the setup of the G4S integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_SCAN_INTERVAL, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    REFRESH_FRESHNESS,
+    SERVICE_GET_HISTORY,
+)
+from custom_components.g4s_alarm.history import G4sEvent
+
+from .fake_g4s import FakeG4sCloud, make_device
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration
+) -> None:
+    """The alarm and the sensors of the installation are created."""
+    assert init_integration.state is ConfigEntryState.LOADED
+    assert hass.states.get("alarm_control_panel.g4s_alarm").state == "disarmed"
+    assert hass.states.get("binary_sensor.front_door").state == "off"
+    assert hass.states.get("sensor.front_door_temperature").state == "21"
+
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    assert init_integration.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_platform_set_up_once_devices_show_up(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    cloud: FakeG4sCloud,
+    config_entry: MockConfigEntry,
+) -> None:
+    """The binary sensor platform is only set up for the first door sensor."""
+    cloud.devices = [make_device(1, "Panel", "PANEL", temperatureLevel=21)]
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert Platform.BINARY_SENSOR not in coordinator.platforms
+
+    cloud.devices.append(make_device(2, "Front door", isOpen=True))
+    freezer.tick(REFRESH_FRESHNESS)
+    await coordinator.async_refresh()
+    # The platform is set up in a background task
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get("binary_sensor.front_door").state == "on"
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_trigger_sensors_report_the_alarm(
+    hass: HomeAssistant, cloud: FakeG4sCloud, config_entry: MockConfigEntry
+) -> None:
+    """Sirens and cameras show whether they triggered the alarm."""
+    cloud.devices.extend(
+        [
+            make_device(2, "Hall siren", "SIREN", isTriggeredAlarm=True),
+            make_device(3, "Hall camera", "CAMERA"),
+        ]
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    siren = hass.states.get("binary_sensor.hall_siren_siren")
+    assert siren.state == "on"
+    assert siren.attributes["device_class"] == "safety"
+    camera = hass.states.get("binary_sensor.hall_camera_motion")
+    assert camera.state == "off"
+    assert camera.attributes["device_class"] == "safety"
+
+
+async def test_get_history_between(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """The service returns the events from start to end of an entry."""
+    history = hass.data[DOMAIN][init_integration.entry_id].history
+    for second in range(5):
+        history.async_record(
+            G4sEvent(float(second), "door_window", "SN00001", bool(second % 2), None)
+        )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {
+            ATTR_CONFIG_ENTRY_ID: init_integration.entry_id,
+            "start": "1970-01-01T00:00:01+00:00",
+            "end": "1970-01-01T00:00:03+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert [(event["time"], event["state"]) for event in response["events"]] == [
+        ("1970-01-01T00:00:01+00:00", True),
+        ("1970-01-01T00:00:02+00:00", False),
+        ("1970-01-01T00:00:03+00:00", True),
+    ]
+    assert {event[ATTR_CONFIG_ENTRY_ID] for event in response["events"]} == {
+        init_integration.entry_id
+    }
+
+
+async def test_get_history_of_unknown_entry(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """Asking for an entry that is not loaded is an error of the caller."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_HISTORY,
+            {ATTR_CONFIG_ENTRY_ID: "unknown"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_options_moved_out_of_the_data(
+    hass: HomeAssistant, cloud: FakeG4sCloud, config_entry: MockConfigEntry
+) -> None:
+    """Options stored in the entry data by older versions become options."""
+    hass.config_entries.async_update_entry(
+        config_entry, data={**config_entry.data, CONF_SCAN_INTERVAL: 30}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert CONF_SCAN_INTERVAL not in config_entry.data
+    assert config_entry.options == {CONF_SCAN_INTERVAL: 30}
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.update_interval == timedelta(seconds=30)
@@ -0,0 +1,75 @@
+"""Tests for the G4S logbook descriptions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.components.logbook import (
+    LOGBOOK_ENTRY_MESSAGE,
+    LOGBOOK_ENTRY_NAME,
+)
+from homeassistant.core import Event, HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.g4s_alarm.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    EVENT_G4S_ALARM,
+)
+from custom_components.g4s_alarm.history import G4sEvent
+from custom_components.g4s_alarm.logbook import async_describe_events
+
+
+def _describer(hass: HomeAssistant) -> Callable[[Event], dict[str, str]]:
+    """Return the function describing the G4S events."""
+    described = {}
+
+    def async_describe_event(
+        domain: str, event_type: str, describe: Callable[[Event], dict[str, str]]
+    ) -> None:
+        described[(domain, event_type)] = describe
+
+    async_describe_events(hass, async_describe_event)
+    return described[(DOMAIN, EVENT_G4S_ALARM)]
+
+
+def _event(entry_id: str, event: G4sEvent) -> Event:
+    return Event(EVENT_G4S_ALARM, {ATTR_CONFIG_ENTRY_ID: entry_id, **event.as_dict()})
+
+
+async def test_alarm_state_change(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Alarm changes are named after the entry and give the user."""
+    describe = _describer(hass)
+
+    assert describe(
+        _event(
+            config_entry.entry_id, G4sEvent(0.0, "alarm", None, "NIGHT_ARM", "Alice")
+        )
+    ) == {
+        LOGBOOK_ENTRY_NAME: config_entry.title,
+        LOGBOOK_ENTRY_MESSAGE: "changed to night arm by Alice",
+    }
+    assert describe(
+        _event("removed", G4sEvent(0.0, "alarm", None, "DISARMED", None))
+    ) == {LOGBOOK_ENTRY_NAME: "G4S", LOGBOOK_ENTRY_MESSAGE: "changed to disarmed"}
+
+
+async def test_device_event(hass: HomeAssistant) -> None:
+    """Device events are named after the device, or its key without a name."""
+    describe = _describer(hass)
+
+    assert describe(
+        _event("entry", G4sEvent(0.0, "door_window", "SN1", True, None, "Front door"))
+    ) == {LOGBOOK_ENTRY_NAME: "Front door", LOGBOOK_ENTRY_MESSAGE: "opened"}
+    assert describe(
+        _event("entry", G4sEvent(0.0, "motion", "SN3", True, None, "Hall camera"))
+    ) == {
+        LOGBOOK_ENTRY_NAME: "Hall camera",
+        LOGBOOK_ENTRY_MESSAGE: "triggered the alarm",
+    }
+    assert describe(_event("entry", G4sEvent(0.0, "smoke", "SN2", False, None))) == {
+        LOGBOOK_ENTRY_NAME: "SN2",
+        LOGBOOK_ENTRY_MESSAGE: "cleared smoke alarm",
+    }
@@ -0,0 +1,243 @@
+"""Tests for the G4S snapshot."""
+
+from __future__ import annotations
+
+from custom_components.g4s_alarm.const import DEVICE_REMOVAL_POLLS
+from custom_components.g4s_alarm.models import (
+    ALARM_CONTEXT,
+    G4sCodeIndex,
+    G4sSnapshot,
+)
+
+from .fake_g4s import PANEL_ID, FakeG4sCloud, make_device, make_user
+
+# Keys of the devices of the installation, their serial numbers
+FRONT_DOOR = "SN00001"
+KITCHEN = "SN00002"
+HUB = "SN00003"
+
+
+def _installation() -> FakeG4sCloud:
+    cloud = FakeG4sCloud()
+    cloud.devices = [
+        make_device(1, "Front door", isOpen=False, temperatureLevel=21),
+        make_device(2, "Kitchen", "SMOKEALARM", temperatureLevel=23, batteryLevel=90),
+        make_device(3, "Hub", "HUB"),
+    ]
+    return cloud
+
+
+def test_first_update_adds_every_category() -> None:
+    """The first update puts every device in its categories."""
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    changed = snapshot.update(_installation().alarm())
+
+    assert set(snapshot.devices) == {FRONT_DOOR, KITCHEN, HUB}
+    assert set(snapshot.door_window) == {FRONT_DOOR}
+    assert set(snapshot.smoke) == {KITCHEN}
+    assert set(snapshot.climate) == {FRONT_DOOR, KITCHEN}
+    assert set(snapshot.battery) == {KITCHEN}
+    assert snapshot.added == changed - {ALARM_CONTEXT}
+    assert ALARM_CONTEXT in changed
+    assert snapshot.alarm == "DISARMED"
+    assert snapshot.changed_by == "Alice"
+    assert not snapshot.transitions
+
+
+def test_unchanged_update_changes_nothing() -> None:
+    """Polling the same data again notifies no listener."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+
+    assert snapshot.update(cloud.alarm()) == set()
+    assert not snapshot.added
+    assert not snapshot.removed
+    assert not snapshot.transitions
+
+
+def test_changed_field_changes_only_its_categories() -> None:
+    """A door opening changes the door/window context and records an event."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    record = snapshot.door_window[FRONT_DOOR]
+
+    cloud.devices[0]["isOpen"] = True
+    assert snapshot.update(cloud.alarm()) == {("door_window", FRONT_DOOR)}
+    assert snapshot.transitions == [
+        ("door_window", FRONT_DOOR, True, None, "Front door")
+    ]
+    # Records are updated in place
+    assert snapshot.door_window[FRONT_DOOR] is record
+    assert record.is_open
+
+    cloud.devices[1]["temperatureLevel"] = 24
+    assert snapshot.update(cloud.alarm()) == {("climate", KITCHEN)}
+    assert not snapshot.transitions
+
+
+def test_alarm_state_change_is_a_transition() -> None:
+    """Arming records who armed the alarm."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+
+    cloud.state = "FULL_ARM"
+    assert snapshot.update(cloud.alarm()) == {ALARM_CONTEXT}
+    assert snapshot.transitions == [(ALARM_CONTEXT, None, "FULL_ARM", "Alice", None)]
+
+
+def test_missing_device_is_removed_after_several_polls() -> None:
+    """A device missing from the polls is unavailable, then removed."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    record = snapshot.devices[KITCHEN]
+    contexts = {("smoke", KITCHEN), ("climate", KITCHEN), ("battery", KITCHEN)}
+
+    del cloud.devices[1]
+    assert snapshot.update(cloud.alarm()) == contexts
+    assert not record.present
+    assert not snapshot.removed
+    for _ in range(DEVICE_REMOVAL_POLLS - 2):
+        assert snapshot.update(cloud.alarm()) == set()
+
+    changed = snapshot.update(cloud.alarm())
+    assert snapshot.removed == contexts
+    assert changed == contexts
+    assert KITCHEN not in snapshot.devices
+
+
+def test_device_back_before_removal() -> None:
+    """A device back in the poll keeps its record and categories."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    record = snapshot.devices[KITCHEN]
+
+    kitchen = cloud.devices.pop(1)
+    snapshot.update(cloud.alarm())
+    cloud.devices.append(kitchen)
+    changed = snapshot.update(cloud.alarm())
+
+    assert ("smoke", KITCHEN) in changed
+    assert not snapshot.added
+    assert not snapshot.transitions
+    assert snapshot.devices[KITCHEN] is record
+    assert record.present
+
+
+def test_missing_reading_keeps_the_category() -> None:
+    """A reading that goes missing does not take the device out of its category."""
+    cloud = _installation()
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+
+    cloud.devices[1]["temperatureLevel"] = None
+    assert snapshot.update(cloud.alarm()) == {("climate", KITCHEN)}
+    assert not snapshot.removed
+    assert snapshot.climate[KITCHEN].temperature_level is None
+
+
+def test_devices_sharing_a_name() -> None:
+    """Devices with the same name are kept apart."""
+    cloud = _installation()
+    cloud.devices.append(make_device(4, "Kitchen", isOpen=True))
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+
+    assert set(snapshot.smoke) == {KITCHEN}
+    assert set(snapshot.door_window) == {FRONT_DOOR, "SN00004"}
+    assert snapshot.update(cloud.alarm()) == set()
+    assert not snapshot.added
+    assert not snapshot.removed
+
+
+def test_key_without_serial_number() -> None:
+    """Devices without a serial number are keyed by the giid and their id."""
+    cloud = _installation()
+    cloud.devices[0]["serialNumber"] = ""
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+
+    assert set(snapshot.door_window) == {f"{PANEL_ID}_1"}
+
+
+def test_restore() -> None:
+    """A stored snapshot restores the records and categories."""
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(_installation().alarm())
+
+    restored = G4sSnapshot(str(PANEL_ID))
+    restored.restore(snapshot.as_dict())
+
+    assert restored.as_dict() == snapshot.as_dict()
+    assert set(restored.climate) == set(snapshot.climate)
+    assert restored.devices[KITCHEN].present
+
+
+def test_code_index() -> None:
+    """User and access chip codes are accepted, others are not."""
+    cloud = _installation()
+    cloud.users.append(make_user(2, "Bob", None))
+    cloud.devices.append(make_device(4, "Tag", "ACCESSCHIP", accessCode="5678"))
+    codes = G4sCodeIndex()
+    codes.update(cloud.alarm())
+
+    assert codes.validate("1234")
+    assert codes.validate("5678")
+    assert not codes.validate("0000")
+    assert not codes.validate(None)
+
+    cloud.users[0]["accessCode"] = "4321"
+    codes.update(cloud.alarm())
+    assert not codes.validate("1234")
+    assert codes.validate("4321")
+
+
+class _SameHash(str):
+    """Code hashing like every other one."""
+
+    def __hash__(self) -> int:
+        return 0
+
+
+def test_code_index_ignores_hash_collisions() -> None:
+    """A changed code is rehashed even if its source hashes like the old one."""
+    cloud = _installation()
+    cloud.users[0]["accessCode"] = _SameHash("1234")
+    codes = G4sCodeIndex()
+    codes.update(cloud.alarm())
+
+    cloud.users[0]["accessCode"] = _SameHash("4321")
+    codes.update(cloud.alarm())
+    assert not codes.validate("1234")
+    assert codes.validate("4321")
+
+
+def test_humidity_reading() -> None:
+    """Humidity readings are numbers, anything else counts as no reading."""
+    cloud = _installation()
+    cloud.devices[0]["attributes"] = {"humidityLevel": "48.5"}
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    assert snapshot.humidity[FRONT_DOOR].humidity_level == 48.5
+
+    cloud.devices[0]["attributes"] = {"humidityLevel": "n/a"}
+    assert snapshot.update(cloud.alarm()) == {("humidity", FRONT_DOOR)}
+    assert snapshot.humidity[FRONT_DOOR].humidity_level is None
+
+
+def test_humidity_reading_skips_non_numeric_keys() -> None:
+    """A later key is used when the first one does not hold a number."""
+    cloud = _installation()
+    cloud.devices[0]["attributes"] = {"humidityLevel": "n/a", "humidity": 51}
+    snapshot = G4sSnapshot(str(PANEL_ID))
+    snapshot.update(cloud.alarm())
+    assert snapshot.humidity[FRONT_DOOR].humidity_level == 51
+
+    cloud.devices[0]["attributes"] = {"humidityLevel": "n/a"}
+    cloud.devices[0]["additionalData"] = {"humidity": "52.5"}
+    snapshot.update(cloud.alarm())
+    assert snapshot.humidity[FRONT_DOOR].humidity_level == 52.5
@@ -0,0 +1,71 @@
+"""Tests for the loop probe."""
+
+from __future__ import annotations
+
+import asyncio
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.g4s_alarm.const import DOMAIN, LOOP_PROBE_INTERVAL
+from custom_components.g4s_alarm.probe import G4sLoopProbe, async_get_loop_probe
+
+LOOP_LAG = "sensor.g4s_event_loop_lag"
+
+
+async def test_measures_a_healthy_node(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The probe records the loop lag and executor wait without any poll."""
+    probe = G4sLoopProbe(hass)
+    unregister = probe.async_register()
+
+    freezer.tick(LOOP_PROBE_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    freezer.tick(LOOP_PROBE_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert probe.loop_lag.count == 2
+    # The executor job finishes on a thread of its own
+    for _ in range(100):
+        if probe.executor_wait.count:
+            break
+        await asyncio.sleep(0.01)
+    assert probe.executor_wait.count >= 1
+    unregister()
+
+
+async def _async_tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    freezer.tick(LOOP_PROBE_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_runs_while_its_sensor_is_enabled(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    init_integration: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """The probe only adds work while a loop probe sensor is enabled."""
+    probe = async_get_loop_probe(hass)
+    assert hass.data[DOMAIN][init_integration.entry_id].probe is probe
+    await _async_tick(hass, freezer)
+    assert probe.loop_lag.count == 0
+
+    entity_registry.async_update_entity(LOOP_LAG, disabled_by=None)
+    assert await hass.config_entries.async_reload(init_integration.entry_id)
+    await hass.async_block_till_done()
+    await _async_tick(hass, freezer)
+    assert probe.loop_lag.count == 1
+
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    await _async_tick(hass, freezer)
+    assert probe.loop_lag.count == 1
@@ -0,0 +1,100 @@
+"""Tests for the shared G4S account sessions."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.g4s_alarm.api import G4sAuthError
+from custom_components.g4s_alarm.const import (
+    CONF_GIID,
+    DATA_SESSIONS,
+    DOMAIN,
+    REFRESH_FRESHNESS,
+)
+from custom_components.g4s_alarm.session import async_get_session
+
+from .fake_g4s import EMAIL, PASSWORD, FakeG4sCloud, FakeG4sNode, make_device
+
+
+async def test_failed_login_keeps_the_session(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """A wrong password does not replace the session of the running entries."""
+    session = hass.data[DATA_SESSIONS][EMAIL]
+    cloud.status = HTTPStatus.UNAUTHORIZED
+
+    candidate = async_get_session(hass, EMAIL, "wrong")
+    assert candidate is not session
+    with pytest.raises(G4sAuthError):
+        await candidate.async_login()
+    assert hass.data[DATA_SESSIONS][EMAIL] is session
+    assert async_get_session(hass, EMAIL, PASSWORD) is session
+
+
+async def test_login_with_a_new_password_replaces_the_session(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """The session is replaced once the new password is accepted."""
+    candidate = async_get_session(hass, EMAIL, "changed")
+    await candidate.async_login()
+    assert hass.data[DATA_SESSIONS][EMAIL] is candidate
+
+
+async def test_unload_drops_the_session(
+    hass: HomeAssistant, cloud: FakeG4sCloud, init_integration: MockConfigEntry
+) -> None:
+    """The password is not kept once no entry uses the session."""
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    assert EMAIL not in hass.data[DATA_SESSIONS]
+
+
+async def test_refresh_pushes_to_the_other_installations(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    aioclient_mock: AiohttpClientMocker,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """One poll of the account updates every installation of it."""
+    node = FakeG4sNode(2, 0, 0.0)
+    node.register(aioclient_mock)
+    entries = []
+    for panel_id, cloud in node.clouds.items():
+        # Both doors have the same id and no serial number
+        cloud.devices = [make_device(1, "Front door", isOpen=False, serialNumber=None)]
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=cloud.name,
+            unique_id=str(panel_id),
+            data={CONF_EMAIL: EMAIL, CONF_PASSWORD: PASSWORD, CONF_GIID: str(panel_id)},
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    assert await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+    doors = {
+        panel_id: entity_registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, f"{panel_id}_1_door_window"
+        )
+        for panel_id in node.clouds
+    }
+    assert all(hass.states.get(door).state == "off" for door in doors.values())
+
+    first, second = node.clouds
+    node.clouds[second].devices[0]["isOpen"] = True
+    freezer.tick(REFRESH_FRESHNESS)
+    await hass.data[DOMAIN][entries[0].entry_id].async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(doors[first]).state == "off"
+    assert hass.states.get(doors[second]).state == "on"